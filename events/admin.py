@@ -1,14 +1,212 @@
-from django.contrib import admin
-from .models import UserProfile, ContactMessage, Event
+import io
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections, DatabaseError
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.functional import cached_property
+
+from .bulk import MoveError, cancel_participations, move_participations
+from .forms import EventImportForm
+from .importer import import_events
+from .models import UserProfile, ContactMessage, Event, EventFullError, EventJoinInfo, EventParticipant, EventSeries
+
+# Rejected rows shown on the import page, the rest are only counted
+IMPORT_ERRORS_SHOWN = 100
+# Unfiltered lists of bigger tables show the database's estimate of the row
+# count instead of running COUNT(*)
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+def estimated_row_count(model, using):
+    """The database's own estimate of the table size, None when it has none."""
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            elif connection.vendor == 'sqlite':
+                # Filled by ANALYZE, the first number is the row count
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        # No statistics yet (sqlite_stat1 only exists after ANALYZE)
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for admin lists of large tables.
+
+    COUNT(*) reads the whole table, so an unfiltered list uses the planner's
+    estimate once it is above ESTIMATED_COUNT_THRESHOLD. Filtered lists
+    still count exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skips the extra COUNT(*) of the whole table shown next to filter results
+    show_full_result_count = False
 
 
 admin.site.register(UserProfile)
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
-    list_display = ("event_name", "sport_type", "event_date", "event_time", "event_location", "total_players")
+class EventAdmin(LargeTableAdmin):
+    list_display = ("event_name", "sport_type", "event_date", "event_time", "event_location", "organizer", "participants")
+    list_select_related = ("organizer",)
     search_fields = ("event_name", "sport_type", "event_location")
     list_filter = ("sport_type", "event_date")
+    autocomplete_fields = ("organizer", "series")
+
+    # seats_taken is the denormalized participant count,
+    # so the list needs no COUNT or join per row
+    @admin.display(description="Participants", ordering="seats_taken")
+    def participants(self, event):
+        return f"{event.seats_taken} / {event.total_players}"
+
+    def get_urls(self):
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='events_event_import'),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        errors = []
+        result = None
+        if request.method == 'POST':
+            form = EventImportForm(request.POST, request.FILES)
+            if form.is_valid():
+                def on_error(line, message):
+                    if len(errors) < IMPORT_ERRORS_SHOWN:
+                        errors.append((line, message))
+
+                # Read the upload as a text stream, it is never loaded whole
+                # utf-8-sig also reads Excel's "CSV UTF-8", which starts with a BOM
+                stream = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+                result = import_events(stream, form.cleaned_data['format'], request.user, on_error=on_error)
+                self.message_user(request, f"Imported {result.created} events, rejected {result.failed} rows.")
+                if result.stopped:
+                    form.add_error('file', result.stopped)
+                if not result.failed:
+                    return redirect('admin:events_event_changelist')
+        else:
+            form = EventImportForm()
+
+        return TemplateResponse(request, 'admin/events/event/import_events.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import events',
+            'form': form,
+            'result': result,
+            'errors': errors,
+        })
+
+
+class MoveParticipantsForm(forms.Form):
+    target = forms.ModelChoiceField(Event.objects.all(), widget=forms.NumberInput, label="Move to event (id)")
+
+
+@admin.register(EventParticipant)
+class EventParticipantAdmin(LargeTableAdmin):
+    list_display = ("user", "event", "joined_at")
+    list_select_related = ("user", "event")
+    # Exact matches only, they use the indexes
+    search_fields = ("=user__username", "=event__id")
+    search_help_text = "Exact username or event id."
+    actions = ["cancel_participations", "move_participations"]
+
+    # Joins go through the site, which claims the seat and saves the join
+    # info, so participations aren't added or re-pointed here. Deletes go
+    # through cancel_participations, which also removes the join info, and
+    # it replaces Django's "Delete selected".
+    readonly_fields = ("user", "event")
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def delete_model(self, request, obj):
+        cancel_participations(EventParticipant.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        cancel_participations(queryset)
+
+    @admin.action(description="Cancel selected participations", permissions=["delete"])
+    def cancel_participations(self, request, queryset):
+        removed = cancel_participations(queryset)
+        self.message_user(request, f"Cancelled {removed} participations.")
+
+    @admin.action(description="Move selected participants to another event", permissions=["change"])
+    def move_participations(self, request, queryset):
+        form = MoveParticipantsForm(request.POST if 'apply' in request.POST else None)
+        if form.is_valid():
+            try:
+                moved = move_participations(queryset, form.cleaned_data['target'])
+            except MoveError as error:
+                self.message_user(request, str(error), messages.ERROR)
+            except EventFullError:
+                self.message_user(request, "The event doesn't have enough free seats.", messages.ERROR)
+            else:
+                self.message_user(request, f"Moved {moved} participants.")
+            return None
+
+        # Ask for the target event, then come back through this action
+        return TemplateResponse(request, 'admin/events/eventparticipant/move_participants.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Move participants',
+            'form': form,
+            'selected': request.POST.getlist(admin.helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+        })
+
+
+@admin.register(EventJoinInfo)
+class EventJoinInfoAdmin(LargeTableAdmin):
+    list_display = ("name", "email", "phone_number", "user", "event", "joined_at")
+    list_select_related = ("user", "event")
+    search_fields = ("=user__username", "=event__id", "=email", "=phone_number")
+    search_help_text = "Exact username, event id, email or phone number."
+
+    # Belongs to an EventParticipant, only the contact details are edited here
+    readonly_fields = ("user", "event")
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(EventSeries)
+class EventSeriesAdmin(admin.ModelAdmin):
+    list_display = ("event_name", "sport_type", "frequency", "start_date", "until", "event_location")
+    search_fields = ("event_name", "sport_type", "event_location")
+    list_filter = ("frequency", "sport_type")
 
 
 @admin.register(ContactMessage)
@@ -0,0 +1,106 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+
+from .pagination import apaginate_events, apaginate_ranked
+from .recommendations import recommended_events
+from .replicas import use_replica
+from .series import apaginate_with_series, next_occurrences
+from .views import (
+    EVENTS_PAGE_SIZE, SEARCH_SERIES_LIMIT, ApiError, api_error, api_events_etag, api_events_query,
+    api_events_response, dashboard_queries, events_query, fill_recommendations, home_page, render_dashboard,
+    render_events_page,
+)
+
+# Async versions of the busiest read views, used instead of the ones in
+# views.py when ASYNC_VIEWS is on (the default under sportsbuddy/asgi.py).
+# Queries go through the async ORM and the independent ones are awaited
+# together. Django still runs each query in a worker thread, so what this
+# saves is the thread held per request while it waits, not query time.
+# Caching and template rendering are the same sync code as in views.py.
+
+
+@use_replica
+async def home(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(await sync_to_async(home_page)(request, False))
+
+    html, recommended = await asyncio.gather(
+        sync_to_async(home_page)(request, True),
+        sync_to_async(recommended_events)(user),
+    )
+    return HttpResponse(await sync_to_async(fill_recommendations)(request, html, recommended))
+
+
+@use_replica
+async def events(request):
+    # Reads the active series from the cache, or the database on a miss
+    query, events, series = await sync_to_async(events_query)(request)
+    if query:
+        page, next_cursor = await apaginate_ranked(events, request.GET.get('after'), EVENTS_PAGE_SIZE)
+        if not request.GET.get('after'):
+            page = await sync_to_async(next_occurrences)(series, SEARCH_SERIES_LIMIT) + page
+    else:
+        page, next_cursor = await apaginate_with_series(events, series, request.GET.get('after'), EVENTS_PAGE_SIZE)
+    return await sync_to_async(render_events_page)(request, query, page, next_cursor)
+
+
+@use_replica
+@require_GET
+async def api_events(request):
+    # What condition() does for the sync view, but the ETag reads the change
+    # marker from the cache, which can't run on the event loop (DatabaseCache
+    # raises SynchronousOnlyOperation, the others would block it)
+    etag = quote_etag(await sync_to_async(api_events_etag)(request))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await api_events_page(request)
+    response.headers.setdefault('ETag', etag)
+    return response
+
+
+async def api_events_page(request):
+    try:
+        fields, queryset, limit = api_events_query(request.GET)
+    except ApiError as error:
+        return api_error(str(error))
+
+    if request.GET.get('q'):
+        page, next_cursor = await apaginate_ranked(queryset, request.GET.get('after'), limit)
+    else:
+        page, next_cursor = await apaginate_events(queryset, request.GET.get('after'), limit)
+    return api_events_response(request, fields, page, next_cursor)
+
+
+async def fetch(rows):
+    return [row async for row in rows]
+
+
+@login_required
+async def dashboard(request):
+    user = await request.auser()
+    queries = dashboard_queries(user)
+    created_series, created_events, joined_events, join_info, past_events, recommended = await asyncio.gather(
+        fetch(queries['created_series'].aiterator()),
+        # Iterated whole rather than with aiterator() to keep the prefetch
+        fetch(queries['created_events']),
+        fetch(queries['joined_events'].aiterator()),
+        fetch(queries['join_info'].aiterator()),
+        fetch(queries['past_events'].aiterator()),
+        sync_to_async(recommended_events)(user),
+    )
+    return await sync_to_async(render_dashboard)(
+        request,
+        created_series=created_series,
+        created_events=created_events,
+        joined_events=joined_events,
+        join_info=join_info,
+        past_events=past_events,
+        recommended=recommended,
+    )
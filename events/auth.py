@@ -0,0 +1,46 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from .metrics import registry
+from .models import UserProfile
+
+# The logged-in user is looked up on every request. CachedModelBackend keeps
+# the User, with their UserProfile already attached, in the cache so a
+# request with a cached session (SESSION_ENGINE = cached_db) needs no auth
+# queries at all. The signals in events/signals.py drop the entry when the
+# user or profile is saved or deleted, which also covers last_login and
+# password changes.
+
+USER_TIMEOUT = 60 * 60
+
+
+def user_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id):
+    cache.delete(user_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = cache.get(user_key(user_id))
+        if user is not None:
+            registry.record_cache('auth_user', hits=1, misses=0)
+        else:
+            registry.record_cache('auth_user', hits=0, misses=1)
+            # The profile comes along in the same query, or is remembered as missing
+            user = User.objects.select_related('userprofile').filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(user_key(user_id), user, USER_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+def get_profile(user):
+    """The user's UserProfile or None, without a query when it is already loaded."""
+    try:
+        return user.userprofile
+    except UserProfile.DoesNotExist:
+        return None
@@ -0,0 +1,99 @@
+from django.db import connections, router, transaction
+from django.db.models import Count, Exists, F, OuterRef
+
+from . import calendar, recommendations
+from .caching import touch_events
+from .fragments import bump_event_version
+from .models import Event, EventFullError, EventJoinInfo, EventParticipant, recount_seats
+
+# Set-based changes to many participations at once, for the admin actions.
+# Each runs a fixed number of statements however many rows are selected.
+# They skip the per-row signals of add_participant/remove_participant, so
+# seats are recounted and the caches those signals keep fresh are
+# invalidated here in bulk.
+
+
+class MoveError(Exception):
+    pass
+
+
+def join_info_of(participants):
+    # The EventJoinInfo rows belonging to these participations
+    return EventJoinInfo.objects.filter(
+        Exists(participants.filter(event=OuterRef('event'), user=OuterRef('user'))),
+    )
+
+
+def delete_rows(queryset):
+    """DELETE the rows in one statement, without loading them to send their signals. Returns the count."""
+    using = router.db_for_write(queryset.model)
+    connection = connections[using]
+    subquery, params = queryset.values('pk').query.get_compiler(using).as_sql()
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({subquery})", params)
+        return cursor.rowcount
+
+
+def participations_changed(event_ids, user_ids):
+    # What the post_save/post_delete signals would have done row by row.
+    # Open live seat streams are not told, the pages show it on reload.
+    def invalidate():
+        for event_id in event_ids:
+            bump_event_version(event_id)
+        touch_events()
+        recommendations.participation_changed(user_ids)
+        calendar.all_calendars_changed()
+
+    transaction.on_commit(invalidate)
+
+
+def cancel_participations(participants):
+    """Remove the participations and their join info, release the seats. Returns the number removed."""
+    # The admin's ordering would end up in DISTINCT and GROUP BY
+    participants = participants.order_by()
+    with transaction.atomic():
+        rows = list(participants.values_list('event_id', 'user_id'))
+        event_ids = {event_id for event_id, _ in rows}
+        join_info_of(participants).delete()
+        removed = delete_rows(participants)
+        recount_seats(event_ids)
+        participations_changed(event_ids, {user_id for _, user_id in rows})
+    return removed
+
+
+def move_participations(participants, target):
+    """Move the participations (with join info) to the target event. Returns the number moved.
+
+    Users already in the target are left where they are. Raises MoveError
+    if a user would be moved twice and EventFullError if the target has
+    too few free seats, in which case nothing changes.
+    """
+    participants = participants.order_by()
+    with transaction.atomic():
+        movable = participants.exclude(event=target).exclude(
+            user__in=EventParticipant.objects.filter(event=target).values('user'),
+        )
+        if movable.values('user').annotate(n=Count('*')).filter(n__gt=1).exists():
+            raise MoveError("A user is selected in more than one event.")
+
+        moved = movable.count()
+        if not moved:
+            return 0
+        # Claim all seats at once, the same way add_participant claims one
+        claimed = Event.objects.filter(id=target.id, seats_taken__lte=F('total_players') - moved).update(
+            seats_taken=F('seats_taken') + moved,
+        )
+        if not claimed:
+            raise EventFullError()
+
+        rows = list(movable.values_list('event_id', 'user_id'))
+        event_ids = {event_id for event_id, _ in rows}
+        # Join info the moved users left behind in the target when they
+        # cancelled there would clash with theirs
+        EventJoinInfo.objects.filter(event=target, user__in=movable.values('user')).delete()
+        join_info_of(movable).update(event=target)
+        movable.update(event=target)
+        recount_seats(event_ids)
+        participations_changed([*event_ids, target.id], [user_id for _, user_id in rows])
+    return moved
@@ -0,0 +1,125 @@
+import time
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import registry
+from django.db.models import Q
+
+from .models import Event, EventSeries
+from .series import paginate_with_series
+
+FEATURED_EVENTS_COUNT = 3
+HOME_GENERATION_KEY = 'home-generation'
+EVENTS_CHANGED_KEY = 'events-last-changed'
+
+
+def get_or_compute(key, compute, timeout, name, stale_key=None, lock_timeout=10, wait=0.5, poll=0.05):
+    """Cache-aside lookup where only one caller recomputes a missing value.
+
+    The first caller to miss takes a short lock and computes. Meanwhile the
+    others get the last value stored under stale_key, or if there is none
+    wait up to ``wait`` seconds for the new one and then compute it
+    themselves: they sit in a worker thread on the async views, which must
+    not be held for long. Only callers that compute count as misses.
+    """
+    value = cache.get(key)
+    locked = value is None and cache.add(f'{key}:lock', 1, lock_timeout)
+    if value is None and not locked:
+        value = cache.get(stale_key) if stale_key else None
+        deadline = time.monotonic() + wait
+        while value is None and time.monotonic() < deadline:
+            time.sleep(poll)
+            value = cache.get(key)
+    if value is not None:
+        registry.record_cache(name, hits=1, misses=0)
+        return value
+    registry.record_cache(name, hits=0, misses=1)
+
+    try:
+        value = compute()
+        cache.set(key, value, timeout)
+        if stale_key:
+            cache.set(stale_key, value, None)
+    finally:
+        if locked:
+            cache.delete(f'{key}:lock')
+    return value
+
+
+def seconds_until_midnight():
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def home_timeout():
+    # Never outlive the day, tomorrow's featured set is different
+    return min(getattr(settings, 'HOME_CACHE_TIMEOUT', 300), seconds_until_midnight())
+
+
+def home_generation():
+    generation = cache.get(HOME_GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(HOME_GENERATION_KEY, generation, None)
+        generation = cache.get(HOME_GENERATION_KEY, generation)
+    return generation
+
+
+def invalidate_home():
+    """Call after creating, editing or deleting an event."""
+    cache.set(HOME_GENERATION_KEY, time.time_ns(), None)
+
+
+def home_cache_key(kind, *parts):
+    return ':'.join(str(part) for part in (kind, home_generation(), date.today().isoformat(), *parts))
+
+
+def stale_key(kind, *parts):
+    # The last value of any generation, served while the current one is computed
+    return ':'.join(str(part) for part in (kind, 'stale', *parts))
+
+
+def featured_events():
+    # Show 3 upcoming events as featured
+    def compute():
+        # Sessions of recurring series count as upcoming events too
+        upcoming = Event.objects.filter(event_date__gte=date.today())
+        return paginate_with_series(upcoming, active_series(), None, FEATURED_EVENTS_COUNT)[0]
+
+    return get_or_compute(home_cache_key('featured-events'), compute, home_timeout(), 'featured_events',
+                          stale_key('featured-events'))
+
+
+def active_series():
+    """Recurring series with sessions still to come. Few, and read by every events list."""
+    def compute():
+        return list(EventSeries.objects.filter(Q(until__isnull=True) | Q(until__gte=date.today())))
+
+    return get_or_compute(home_cache_key('active-series'), compute, home_timeout(), 'active_series',
+                          stale_key('active-series'))
+
+
+def cached_home_page(authenticated, render):
+    """Rendered home page HTML, one copy for visitors and one for logged-in users."""
+    return get_or_compute(home_cache_key('home-page', int(authenticated)), render, home_timeout(), 'home_page',
+                          stale_key('home-page', int(authenticated)))
+
+
+def touch_events():
+    """Record that some event or participation changed (see events/signals.py)."""
+    cache.set(EVENTS_CHANGED_KEY, time.time(), None)
+
+
+def events_change_marker():
+    """Timestamp of the last change to any event, without touching the events tables.
+
+    If the marker was evicted, assume "now" so clients refetch once.
+    """
+    changed = cache.get(EVENTS_CHANGED_KEY)
+    if changed is None:
+        changed = time.time()
+        cache.add(EVENTS_CHANGED_KEY, changed, None)
+    return changed
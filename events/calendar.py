@@ -0,0 +1,159 @@
+import time
+from datetime import date, datetime, timezone
+
+from django.core import signing
+from django.core.cache import cache
+
+from .models import Event, EventParticipant, EventSeries
+
+# Per-user iCalendar feed of joined and organized events, for calendar apps
+# to subscribe to. The URL carries a signed user id, so it works without a
+# login and is checked without a query. Calendar apps poll it every few
+# minutes: each user has a change stamp in the cache, bumped by
+# events/signals.py and by code that writes without signals (the importer),
+# and unchanged polls get a 304 from its ETag alone. There is no
+# Last-Modified: HTTP dates have one second resolution, so a second change
+# within the same second would still get a 304.
+
+TOKEN_SALT = 'events.calendar'
+STAMP_PREFIX = 'calendar-stamp:'
+ALL_STAMP_KEY = 'calendar-stamp-all'
+# Events have a start time only, calendars show them this long
+EVENT_DURATION = 'PT2H'
+FEED_CHUNK_SIZE = 500
+
+
+def calendar_token(user):
+    return signing.Signer(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def user_id_from_token(token):
+    try:
+        return int(signing.Signer(salt=TOKEN_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def calendar_changed(user_ids):
+    """Record that these users' feeds changed."""
+    now = time.time()
+    cache.set_many({f'{STAMP_PREFIX}{user_id}': now for user_id in user_ids}, None)
+
+
+def all_calendars_changed():
+    # For bulk changes where listing every affected user would cost more
+    # than one refetch by everyone
+    cache.set(ALL_STAMP_KEY, time.time(), None)
+
+
+def event_changed(event):
+    # The organizer's feed and those of everyone who joined
+    participants = EventParticipant.objects.filter(event_id=event.id).values_list('user_id', flat=True)
+    calendar_changed([event.organizer_id, *participants])
+
+
+def calendar_stamp(user_id):
+    """When the user's feed last changed, "now" if the stamp was evicted."""
+    key = f'{STAMP_PREFIX}{user_id}'
+    stamps = cache.get_many([key, ALL_STAMP_KEY])
+    stamp = stamps.get(key)
+    if stamp is None:
+        stamp = time.time()
+        cache.add(key, stamp, None)
+    return max(stamp, stamps.get(ALL_STAMP_KEY, 0))
+
+
+def escape(text):
+    text = (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+    return text.replace('\r\n', '\\n').replace('\n', '\\n')
+
+
+def fold(line):
+    # Content lines are at most 75 octets, longer ones continue after CRLF + space
+    parts = []
+    current, size = '', 0
+    for char in line:
+        length = len(char.encode())
+        if size + length > 75:
+            parts.append(current)
+            current, size = ' ', 1
+        current += char
+        size += length
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def local_time(day, at):
+    # Floating times: shown at the same clock time wherever the phone is
+    return datetime.combine(day, at).strftime('%Y%m%dT%H%M%S')
+
+
+def event_lines(event, uid, dtstamp, properties=()):
+    yield 'BEGIN:VEVENT'
+    yield f'UID:{uid}'
+    yield f'DTSTAMP:{dtstamp}'
+    yield from properties
+    yield f'DTSTART:{local_time(event.event_date, event.event_time)}'
+    yield f'DURATION:{EVENT_DURATION}'
+    yield f'SUMMARY:{escape(event.event_name)}'
+    yield f'LOCATION:{escape(event.event_location)}'
+    yield f'CATEGORIES:{escape(event.sport_type)}'
+    if event.event_description:
+        yield f'DESCRIPTION:{escape(event.event_description)}'
+    yield 'END:VEVENT'
+
+
+def series_lines(series, dtstamp):
+    rule = {
+        EventSeries.WEEKLY: 'FREQ=WEEKLY',
+        EventSeries.BIWEEKLY: 'FREQ=WEEKLY;INTERVAL=2',
+        # Months without the day are skipped, as in EventSeries.dates()
+        EventSeries.MONTHLY: 'FREQ=MONTHLY',
+    }[series.frequency]
+    if series.until:
+        rule += f';UNTIL={local_time(series.until, series.event_time)}'
+
+    properties = [f'RRULE:{rule}'] + [
+        f'EXDATE:{local_time(date.fromisoformat(day), series.event_time)}' for day in series.skipped_dates
+    ]
+    return event_lines(series.occurrence(series.start_date), f'series-{series.id}@sportarena', dtstamp, properties)
+
+
+def calendar_lines(user_id):
+    """The user's feed as content lines, not yet folded."""
+    dtstamp = datetime.fromtimestamp(int(calendar_stamp(user_id)), tz=timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    yield 'BEGIN:VCALENDAR'
+    yield 'VERSION:2.0'
+    yield 'PRODID:-//SportArena//Events//EN'
+    yield 'CALSCALE:GREGORIAN'
+    yield 'X-WR-CALNAME:SportArena'
+
+    for series in EventSeries.objects.filter(organizer_id=user_id).iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield from series_lines(series, dtstamp)
+
+    organized = Event.objects.filter(organizer_id=user_id).select_related('series')
+    for event in organized.iterator(chunk_size=FEED_CHUNK_SIZE):
+        if event.series_id:
+            # A session of one of the series above, saved with its own details
+            series = event.series
+            recurrence_id = f'RECURRENCE-ID:{local_time(event.occurrence_date, series.event_time)}'
+            yield from event_lines(event, f'series-{series.id}@sportarena', dtstamp, [recurrence_id])
+        else:
+            yield from event_lines(event, f'event-{event.id}@sportarena', dtstamp)
+
+    joined = EventParticipant.objects.filter(user_id=user_id).exclude(event__organizer_id=user_id).select_related('event')
+    for participant in joined.iterator(chunk_size=FEED_CHUNK_SIZE):
+        yield from event_lines(participant.event, f'event-{participant.event_id}@sportarena', dtstamp)
+
+    yield 'END:VCALENDAR'
+
+
+def calendar_feed(user_id):
+    """The feed as text chunks for a streaming response."""
+    chunk = []
+    for line in calendar_lines(user_id):
+        chunk.append(fold(line))
+        if len(chunk) == FEED_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    yield ''.join(chunk)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Applied to every new SQLite connection when SQLITE_PRODUCTION is on (see
+# settings.py). WAL lets readers run alongside the single writer, and with
+# WAL synchronous=NORMAL only syncs at checkpoints: a power cut can lose the
+# last commits but never corrupts the database.
+
+PRODUCTION_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+]
+
+
+def tune_sqlite(cursor, busy_timeout):
+    for pragma in PRODUCTION_PRAGMAS:
+        cursor.execute(pragma)
+    # Same as the driver's timeout option, set here too for raw connections
+    cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout * 1000)}')
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and getattr(settings, 'SQLITE_PRODUCTION', False):
+        with connection.cursor() as cursor:
+            tune_sqlite(cursor, getattr(settings, 'SQLITE_BUSY_TIMEOUT', 5))
@@ -1,18 +1,9 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
-from .models import Event, ContactMessage
-
-SPORT_CHOICES = [
-    ('Football', 'Football'),
-    ('Cricket', 'Cricket'),
-    ('Badminton', 'Badminton'),
-    ('Basketball', 'Basketball'),
-    ('Tennis', 'Tennis'),
-    ('Volleyball', 'Volleyball'),
-    ('Table Tennis', 'Table Tennis'),
-    ('Running', 'Running'),
-]
+from .models import Event, EventSeries, ContactMessage
+from .sports import SPORT_CHOICES
+
 
 class EventForm(forms.ModelForm):  
     sport_type = forms.ChoiceField(choices=SPORT_CHOICES)
@@ -34,6 +25,56 @@ class EventForm(forms.ModelForm):
         }
 
 
+class NewEventForm(EventForm):
+    """EventForm for the add event page, which can also start a recurring series."""
+    repeat = forms.ChoiceField(choices=[('', 'Does not repeat')] + EventSeries.FREQUENCY_CHOICES, required=False)
+    repeat_until = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, until = cleaned_data.get('event_date'), cleaned_data.get('repeat_until')
+        if start and until and until < start:
+            self.add_error('repeat_until', "The series must end after its first session.")
+        return cleaned_data
+
+    def save_series(self, organizer):
+        data = self.cleaned_data
+        return EventSeries.objects.create(
+            organizer=organizer,
+            frequency=data['repeat'],
+            start_date=data['event_date'],
+            until=data['repeat_until'],
+            **{field: data[field] for field in self.Meta.fields if field != 'event_date'},
+        )
+
+
+class SeriesForm(forms.ModelForm):
+    """Edits a whole series. Its start and repeat rule stay as they are, the dates are already out there."""
+    sport_type = forms.ChoiceField(choices=SPORT_CHOICES)
+
+    class Meta:
+        model = EventSeries
+        fields = [
+            'sport_type',
+            'event_name',
+            'event_time',
+            'event_location',
+            'total_players',
+            'event_description',
+            'until',
+        ]
+        widgets = {
+            'event_time': forms.TimeInput(attrs={'type': 'time'}),
+            'until': forms.DateInput(attrs={'type': 'date'}),
+        }
+
+    def clean_until(self):
+        until = self.cleaned_data.get('until')
+        if until and until < self.instance.start_date:
+            raise forms.ValidationError("The series must end after its first session.")
+        return until
+
+
 class RegisterForm(UserCreationForm):
     email = forms.EmailField(required=True)
     sports_interested = forms.ChoiceField(
@@ -85,3 +126,18 @@ class ContactForm(forms.ModelForm):
     class Meta:
         model = ContactMessage
         fields = ['name', 'email', 'message']
+
+
+class EventImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with a header row, or JSON Lines, using the add event form's field names.")
+    format = forms.ChoiceField(choices=[('', 'From file extension'), ('csv', 'CSV'), ('jsonl', 'JSON Lines')], required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get('file')
+        if upload and not cleaned_data.get('format'):
+            extension = upload.name.rsplit('.', 1)[-1].lower()
+            if extension not in ('csv', 'jsonl'):
+                raise forms.ValidationError("Choose a format, the file extension is not .csv or .jsonl.")
+            cleaned_data['format'] = extension
+        return cleaned_data
@@ -0,0 +1,79 @@
+import time
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .metrics import registry
+
+# Rendered event cards are cached per event under a version number. The
+# signals in events/signals.py bump the version when the event or its
+# participants change, so stale cards are never read again and simply
+# expire from the cache. Generated occurrences of a series (without an
+# Event row) share one version per series, named by series_version_id.
+
+CARD_TEMPLATE = 'events/event_card.html'
+CARD_TIMEOUT = 60 * 60 * 24
+
+
+def version_key(event_id):
+    return f'event-card-version:{event_id}'
+
+
+def card_key(event_id, version, authenticated):
+    return f'event-card:{event_id}:{version}:{int(authenticated)}'
+
+
+def series_version_id(series_id):
+    return f'series-{series_id}'
+
+
+def card_ids(event):
+    """(version id, card id) of an event or generated series occurrence."""
+    if event.pk is None:
+        version_id = series_version_id(event.series_id)
+        return version_id, f'{version_id}-{event.event_date.isoformat()}'
+    return event.pk, event.pk
+
+
+def bump_event_version(event_id):
+    try:
+        cache.incr(version_key(event_id))
+    except ValueError:
+        # Not cached yet (or evicted), any fresh value invalidates old cards
+        cache.set(version_key(event_id), time.time_ns(), None)
+
+
+def get_versions(event_ids):
+    versions = cache.get_many([version_key(event_id) for event_id in event_ids])
+    missing = {}
+    for event_id in event_ids:
+        key = version_key(event_id)
+        if key not in versions:
+            # A card cached before the version was evicted must not match
+            missing[key] = versions[key] = time.time_ns()
+    if missing:
+        cache.set_many(missing, None)
+    return {event_id: versions[version_key(event_id)] for event_id in event_ids}
+
+
+def render_event_cards(events, user):
+    """Return the HTML card of every event, rendering only the cache misses."""
+    authenticated = user.is_authenticated
+    ids = [card_ids(event) for event in events]
+    versions = get_versions(list(dict.fromkeys(version_id for version_id, _ in ids)))
+    keys = [card_key(card_id, versions[version_id], authenticated) for version_id, card_id in ids]
+    cached = cache.get_many(keys)
+
+    cards = []
+    rendered = {}
+    for event, key in zip(events, keys):
+        html = cached.get(key)
+        if html is None:
+            html = rendered[key] = render_to_string(CARD_TEMPLATE, {'event': event, 'user': user})
+        cards.append(mark_safe(html))
+
+    if rendered:
+        cache.set_many(rendered, CARD_TIMEOUT)
+    registry.record_cache('event_card', hits=len(events) - len(rendered), misses=len(rendered))
+    return cards
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from .sports import IMAGES_DIR
+
+# Responsive sport artwork. `manage.py build_images` resizes every original
+# in events/static/events/images into a few widths and formats, names each
+# variant after a hash of its content (so it can be cached forever) and
+# writes a manifest. The {% responsive_image %} tag reads the manifest to
+# emit <picture>/srcset markup, and falls back to the original file when
+# the build step has not been run.
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+VARIANTS_DIR = f'{IMAGES_DIR}/variants'
+MANIFEST_PATH = STATIC_DIR / VARIANTS_DIR / 'manifest.json'
+
+WIDTHS = (320, 640, 960, 1280)
+# Best first: browsers take the first <source> type they support
+FORMATS = {
+    'avif': {'mime': 'image/avif', 'pil': 'AVIF', 'options': {'quality': 50}},
+    'webp': {'mime': 'image/webp', 'pil': 'WEBP', 'options': {'quality': 75, 'method': 6}},
+    'jpeg': {'mime': 'image/jpeg', 'pil': 'JPEG', 'options': {'quality': 75, 'optimize': True, 'progressive': True}},
+}
+SOURCE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+HASH_LENGTH = 12
+
+
+@lru_cache(maxsize=None)
+def load_manifest():
+    # Read once per process; call load_manifest.cache_clear() after a rebuild
+    try:
+        with open(MANIFEST_PATH) as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+
+
+def variant_name(stem, width, content, extension):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    return f'{stem}.{width}.{digest}.{extension}'
+
+
+def supported_formats():
+    from PIL import Image
+
+    Image.init()
+    return [name for name, spec in FORMATS.items() if spec['pil'] in Image.SAVE]
+
+
+def encode(image, width, fmt):
+    from PIL import Image
+
+    height = round(image.height * width / image.width)
+    resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+    if fmt == 'jpeg' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+    buffer = io.BytesIO()
+    resized.save(buffer, FORMATS[fmt]['pil'], **FORMATS[fmt]['options'])
+    return buffer.getvalue(), height
+
+
+def build_variants(source_dir=STATIC_DIR / IMAGES_DIR, output_dir=STATIC_DIR / VARIANTS_DIR,
+                   widths=WIDTHS, formats=None):
+    """Generate every variant and write the manifest. Returns the manifest.
+
+    Needs Pillow. Widths above an original's own width are skipped (we
+    never upscale); an original narrower than all of them gets one variant
+    at its own width. Formats this Pillow build cannot encode are skipped.
+    """
+    from PIL import Image
+
+    formats = [fmt for fmt in (formats or FORMATS) if fmt in supported_formats()]
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    for source in sorted(Path(source_dir).iterdir()):
+        if source.suffix.lower() not in SOURCE_SUFFIXES:
+            continue
+        with Image.open(source) as original:
+            original.load()
+            sizes = [width for width in widths if width <= original.width] or [original.width]
+            entry = {'width': original.width, 'height': original.height, 'variants': {}}
+            for fmt in formats:
+                entry['variants'][fmt] = []
+                for width in sizes:
+                    content, height = encode(original, width, fmt)
+                    name = variant_name(source.stem, width, content, 'jpg' if fmt == 'jpeg' else fmt)
+                    target = output_dir / name
+                    if not target.exists():
+                        target.write_bytes(content)
+                    entry['variants'][fmt].append({
+                        'path': f'{VARIANTS_DIR}/{name}', 'width': width, 'height': height, 'bytes': len(content),
+                    })
+        manifest[f'{IMAGES_DIR}/{source.name}'] = entry
+
+    with open(output_dir / 'manifest.json', 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    load_manifest.cache_clear()
+    return manifest
+
+
+def remove_stale_variants(manifest, output_dir=STATIC_DIR / VARIANTS_DIR):
+    """Delete variant files no longer listed in the manifest. Returns how many."""
+    keep = {
+        Path(variant['path']).name
+        for entry in manifest.values()
+        for variants in entry['variants'].values()
+        for variant in variants
+    }
+    removed = 0
+    for path in Path(output_dir).iterdir():
+        if path.name != 'manifest.json' and path.name not in keep:
+            path.unlink()
+            removed += 1
+    return removed
@@ -0,0 +1,130 @@
+import csv
+import json
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import calendar, recommendations
+from .caching import invalidate_home, touch_events
+from .forms import EventForm
+from .models import Event
+
+# Streaming event import for season fixtures. Rows are read one at a time,
+# validated with EventForm (so SPORT_CHOICES and field rules match the add
+# event page) and inserted with bulk_create in batches, each batch in its
+# own transaction. Only the current batch is ever held in memory.
+
+IMPORT_FIELDS = EventForm.Meta.fields
+
+
+def read_csv(stream):
+    for line, row in enumerate(csv.DictReader(stream), start=2):
+        yield line, row
+
+
+def read_jsonl(stream):
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as error:
+            yield line, error
+            continue
+        yield line, row if isinstance(row, dict) else ValueError("Each line must be a JSON object.")
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+def read_rows(stream, file_format):
+    # Decoding happens as the stream is read, so a file that isn't UTF-8
+    # fails part way through. Yield the error in place of the row instead.
+    rows = READERS[file_format](stream)
+    line = 0
+    while True:
+        try:
+            line, row = next(rows)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as error:
+            yield line + 1, error
+            return
+        yield line, row
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        # Why the import stopped before the end of the file, if it did
+        self.stopped = None
+
+
+def import_events(stream, file_format, organizer, batch_size=1000, on_error=None):
+    """Import events from a text stream. Returns an ImportResult.
+
+    ``organizer`` owns every event unless a row names another username in
+    an ``organizer`` column. ``on_error(line, message)`` is called for each
+    rejected row as soon as it is seen.
+    """
+    result = ImportResult()
+    organizers = {organizer.username: organizer}
+    sports = set()
+    organizer_ids = set()
+    batch = []
+
+    def reject(line, message):
+        result.failed += 1
+        if on_error:
+            on_error(line, message)
+
+    def flush():
+        with transaction.atomic():
+            Event.objects.bulk_create(batch)
+        result.created += len(batch)
+        sports.update(event.sport_type for event in batch)
+        organizer_ids.update(event.organizer_id for event in batch)
+        batch.clear()
+
+    for line, row in read_rows(stream, file_format):
+        if isinstance(row, UnicodeDecodeError):
+            result.stopped = "The file is not UTF-8 text, save it as CSV UTF-8. Rows before this line were imported."
+            reject(line, result.stopped)
+            break
+        if isinstance(row, Exception):
+            reject(line, str(row))
+            continue
+
+        # JSON values can be numbers, usernames are compared as text
+        username = str(row.get('organizer') or organizer.username).strip()
+        if username not in organizers:
+            organizers[username] = User.objects.filter(username=username).first()
+        if organizers[username] is None:
+            reject(line, f"Unknown organizer '{username}'.")
+            continue
+
+        # Only missing values are blank, a JSON 0 stays 0
+        form = EventForm(data={field: '' if row.get(field) is None else row.get(field) for field in IMPORT_FIELDS})
+        if not form.is_valid():
+            reject(line, '; '.join(
+                f"{field}: {' '.join(messages)}" for field, messages in form.errors.items()
+            ))
+            continue
+
+        event = form.save(commit=False)
+        event.organizer = organizers[username]
+        batch.append(event)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    if result.created:
+        # bulk_create sends no signals, refresh the caches that listen to them
+        invalidate_home()
+        touch_events()
+        recommendations.events_changed(sports)
+        calendar.calendar_changed(organizer_ids)
+    return result
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+# Live seat counts. When participants change, events/signals.py publishes
+# {"event": id, "seats_taken": n, "total_players": m} to the broker, and the
+# broker fans it out to every open /events/live/ stream in this process.
+# Each stream keeps only the latest message per event, so a busy event
+# costs a slow client one message, not one per join.
+
+
+class Subscription:
+    def __init__(self, loop, event_ids=None):
+        self.loop = loop
+        self.event_ids = event_ids
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def offer(self, message):
+        # Runs on the subscriber's event loop
+        if self.event_ids is None or message['event'] in self.event_ids:
+            self.pending[message['event']] = message
+            self.ready.set()
+
+    async def next_batch(self, timeout):
+        """Wait up to timeout seconds for messages, return them (possibly none)."""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.ready.clear()
+        batch, self.pending = list(self.pending.values()), {}
+        return batch
+
+
+class LocalBroker:
+    """Fan-out to the streams of this process only.
+
+    Enough for a single ASGI process. With several processes each only
+    sees its own joins, use a shared backend such as PostgresNotifyBroker.
+    """
+
+    def __init__(self):
+        self.subscriptions = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self, event_ids=None):
+        subscription = Subscription(asyncio.get_running_loop(), event_ids)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, message):
+        self.deliver(message)
+
+    def deliver(self, message):
+        # Called from any thread, each subscription is handed the message on its own loop
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # Its loop has closed, the stream is gone
+                self.unsubscribe(subscription)
+
+
+class PostgresNotifyBroker(LocalBroker):
+    """Shares messages between processes with PostgreSQL LISTEN/NOTIFY.
+
+    Each process opens one extra connection, on the first subscription, to
+    listen for messages and hands them to its local streams.
+    """
+
+    CHANNEL = 'seat_changes'
+
+    def __init__(self):
+        super().__init__()
+        self.listener = None
+
+    def subscribe(self, event_ids=None):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, name='seat-listener', daemon=True)
+                self.listener.start()
+        return super().subscribe(event_ids)
+
+    def publish(self, message):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.CHANNEL, json.dumps(message)])
+
+    def listen(self):
+        while True:
+            try:
+                listener = connection.Database.connect(**connection.get_connection_params(), autocommit=True)
+                with listener:
+                    listener.execute(f'LISTEN {self.CHANNEL}')
+                    for notify in listener.notifies():
+                        self.deliver(json.loads(notify.payload))
+            except Exception:
+                logger.exception("Seat change listener failed, reconnecting")
+                threading.Event().wait(5)
+
+
+_broker = None
+
+
+def get_broker():
+    """Return the broker named by SEAT_BROKER_BACKEND, or one matching the database."""
+    global _broker
+    if _broker is None:
+        path = getattr(settings, 'SEAT_BROKER_BACKEND', None)
+        if path:
+            _broker = import_string(path)()
+        elif connection.vendor == 'postgresql':
+            _broker = PostgresNotifyBroker()
+        else:
+            _broker = LocalBroker()
+    return _broker
+
+
+def publish_seats(event_id):
+    """Send the event's current seat count to every stream (call after commit)."""
+    seats = Event.objects.filter(id=event_id).values_list('seats_taken', 'total_players').first()
+    if seats is not None:
+        get_broker().publish({'event': event_id, 'seats_taken': seats[0], 'total_players': seats[1]})
+
+
+def format_sse(messages):
+    return ''.join(f'event: seats\ndata: {json.dumps(message)}\n\n' for message in messages)
@@ -0,0 +1,156 @@
+import json
+import random
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, close_old_connections
+from django.test import Client
+from django.urls import reverse
+
+from events.models import Event
+
+# Weighted route mix, roughly what production traffic looks like
+ROUTES = {
+    'home': 30,
+    'events': 25,
+    'events_search': 15,
+    'dashboard': 15,
+    'join_event': 15,
+}
+SEARCH_TERMS = ['football', 'cric', 'mumbai', 'sunday', 'open', 'pune', 'tennis', 'league']
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Replay a weighted mix of requests against the current database and report latency and query counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per worker thread (default: 1000).")
+        parser.add_argument('--concurrency', type=int, default=1, help="Number of worker threads (default: 1).")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+        parser.add_argument('--compare', help="Previous JSON results to compare against.")
+        parser.add_argument('--label', default='', help="Free-form label stored with the results, e.g. a commit hash.")
+
+    def handle(self, *args, **options):
+        user_ids = list(User.objects.filter(userprofile__isnull=False).values_list('id', flat=True)[:1000])
+        event_ids = list(Event.objects.values_list('id', flat=True)[:5000])
+        if not user_ids or not event_ids:
+            raise CommandError("No data to benchmark, run 'manage.py seed_data' first.")
+        close_old_connections()
+
+        samples = {route: [] for route in ROUTES}
+        errors = {route: 0 for route in ROUTES}
+        lock = threading.Lock()
+
+        def worker(number):
+            rng = random.Random(options['seed'] + number)
+            client = Client(HTTP_HOST='localhost')
+            user = User.objects.get(id=rng.choice(user_ids))
+            client.force_login(user)
+            counter = QueryCounter()
+            routes, weights = list(ROUTES), list(ROUTES.values())
+            try:
+                with connection.execute_wrapper(counter):
+                    for _ in range(options['requests']):
+                        route = rng.choices(routes, weights)[0]
+                        counter.count = 0
+                        start = time.perf_counter()
+                        response = self.request(client, user, route, rng, event_ids)
+                        latency = time.perf_counter() - start
+                        with lock:
+                            samples[route].append((latency, counter.count))
+                            if response.status_code >= 400:
+                                errors[route] += 1
+            finally:
+                close_old_connections()
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        total = sum(len(route_samples) for route_samples in samples.values())
+        results = {
+            'label': options['label'],
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'concurrency': options['concurrency'],
+            'requests': total,
+            'seconds': round(elapsed, 3),
+            'throughput_rps': round(total / elapsed, 2),
+            'routes': {},
+        }
+        for route, route_samples in samples.items():
+            latencies = [latency * 1000 for latency, queries in route_samples]
+            queries = [queries for latency, queries in route_samples]
+            results['routes'][route] = {
+                'count': len(route_samples),
+                'errors': errors[route],
+                'p50_ms': round(percentile(latencies, 50), 3),
+                'p95_ms': round(percentile(latencies, 95), 3),
+                'p99_ms': round(percentile(latencies, 99), 3),
+                'queries_per_request': round(sum(queries) / len(queries), 2) if queries else 0,
+            }
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+        self.report(results, baseline)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def request(self, client, user, route, rng, event_ids):
+        if route == 'home':
+            return client.get(reverse('home'))
+        if route == 'events':
+            return client.get(reverse('events'))
+        if route == 'events_search':
+            return client.get(reverse('events'), {'q': rng.choice(SEARCH_TERMS)})
+        if route == 'dashboard':
+            return client.get(reverse('dashboard'))
+        # Joins are real writes, most of them end as "full" or "already joined"
+        return client.post(reverse('join_event', args=[rng.choice(event_ids)]), {
+            'name': 'Benchmark Runner', 'email': user.email, 'phone_number': '9999999999',
+        })
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f"{results['requests']} requests in {results['seconds']}s "
+            f"({results['throughput_rps']} req/s, concurrency {results['concurrency']})"
+        )
+        self.stdout.write(f"{'route':<15}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+        for route, row in results['routes'].items():
+            line = (f"{route:<15}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>10}"
+                    f"{row['p95_ms']:>10}{row['p99_ms']:>10}{row['queries_per_request']:>9}")
+            previous = baseline['routes'].get(route) if baseline else None
+            if previous and previous['p95_ms']:
+                change = (row['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+                line += f"   p95 {change:+.1f}%, queries {previous['queries_per_request']} -> {row['queries_per_request']}"
+            self.stdout.write(line)
+        if baseline:
+            self.stdout.write(f"throughput {baseline['throughput_rps']} -> {results['throughput_rps']} req/s")
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchmark import percentile
+
+# Read-only paths, weighted roughly like production traffic
+PATHS = {
+    '/': 35,
+    '/events/': 30,
+    '/events/?q=football': 15,
+    '/api/events/?limit=50': 20,
+}
+
+
+async def fetch(host, port, path):
+    # One request per connection, like clients behind a load balancer without keep-alive
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server (WSGI or ASGI) with many concurrent read requests and report throughput. "
+        "Only talks HTTP, start the server separately."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="Base URL of the server, e.g. http://127.0.0.1:8000")
+        parser.add_argument('--concurrency', type=int, default=200, help="Requests in flight at once (default: 200).")
+        parser.add_argument('--seconds', type=float, default=20, help="How long to run (default: 20).")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--label', default='', help="Free-form label stored with the results, e.g. 'asgi'.")
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError("The URL must look like http://host:port")
+        summary = asyncio.run(self.run(url.hostname, url.port or 80, options))
+        for key, value in summary.items():
+            self.stdout.write(f"{key:<20} {value}")
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(summary, f, indent=2)
+
+    async def run(self, host, port, options):
+        rng = random.Random(options['seed'])
+        paths, weights = list(PATHS), list(PATHS.values())
+        latencies = []
+        statuses = {}
+        errors = 0
+        deadline = time.monotonic() + options['seconds']
+
+        async def client():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                path = rng.choices(paths, weights)[0]
+                start = time.perf_counter()
+                try:
+                    status = await fetch(host, port, path)
+                except OSError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        elapsed = time.monotonic() - started
+
+        return {
+            'label': options['label'],
+            'concurrency': options['concurrency'],
+            'seconds': round(elapsed, 1),
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p95_ms': round(percentile(latencies, 95), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+            'connection_errors': errors,
+        }
@@ -0,0 +1,130 @@
+import time
+from datetime import date, time as clock, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+from events.fragments import CARD_TEMPLATE
+from events.models import Event
+from events.sports import SPORTS
+
+UNCACHED_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+# The card as it was before the sport registry: the artwork picked by an
+# if/elif chain on sport_type. Only used as a baseline for the registry card.
+CHAIN_CARD = """{% load static %}
+<div class="event-card"{% if event.id %} data-event-id="{{ event.id }}"{% endif %} data-join-url="{{ event.get_join_url }}">
+  <div class="event-image">
+    {% if event.sport_type == 'Football' %}
+      <img src="{% static 'events/images/football.jpg' %}" alt="Football Event">
+    {% elif event.sport_type == 'Cricket' %}
+      <img src="{% static 'events/images/cricket.jpg' %}" alt="Cricket Event">
+    {% elif event.sport_type == 'Basketball' %}
+      <img src="{% static 'events/images/basketball.jpg' %}" alt="Basketball Event">
+    {% elif event.sport_type == 'Badminton' %}
+      <img src="{% static 'events/images/badminton.jpg' %}" alt="Badminton Event">
+    {% elif event.sport_type == 'Tennis' %}
+      <img src="{% static 'events/images/tennis.jpg' %}" alt="Tennis Event">
+    {% elif event.sport_type == 'Volleyball' %}
+      <img src="{% static 'events/images/volleyball.jpg' %}" alt="Volleyball Event">
+    {% elif event.sport_type == 'Table Tennis' %}
+      <img src="{% static 'events/images/tabletennis.jpg' %}" alt="Table Tennis Event">
+    {% elif event.sport_type == 'Running' %}
+      <img src="{% static 'events/images/running.jpg' %}" alt="Running Event">
+    {% else %}
+      <img src="{% static 'events/images/bg2.jpg' %}" alt="Event Image">
+    {% endif %}
+  </div>
+  <div class="event-details">
+    <h3>{{ event.event_name }}</h3>
+    <p><strong>Sport:</strong> {{ event.sport_type }}</p>
+    <p><strong>Date:</strong> {{ event.event_date }} | <strong>Time:</strong> {{ event.event_time }}</p>
+    <p><strong>Location:</strong> {{ event.event_location }}</p>
+    <p><strong>Players:</strong> <span class="seats-taken">{{ event.seats_taken }}</span> / <span class="total-players">{{ event.total_players }}</span></p>
+  </div>
+
+  <div class="event-actions">
+      {% if user.is_authenticated %}
+          {% if not event.is_full %}
+              <a href="{{ event.get_join_url }}" class="btn-join-event">Join Event</a>
+          {% else %}
+              <button class="btn-disabled" disabled>Event Full</button>
+          {% endif %}
+      {% else %}
+          <a href="{% url 'user_login' %}" class="btn-login">Login Req.</a>
+      {% endif %}
+  </div>
+
+</div>
+"""
+
+def sample_events(count):
+    # Unsaved events, so only template work is measured
+    return [
+        Event(
+            id=i + 1, event_name=f'Event {i}', sport_type=SPORTS[i % len(SPORTS)].label,
+            event_date=date.today() + timedelta(days=i % 30), event_time=clock(10, 0),
+            event_location='Ahmedabad', total_players=10, seats_taken=i % 11, event_description='',
+        )
+        for i in range(count)
+    ]
+
+
+def uncached_engine():
+    # Same backend and options as settings.TEMPLATES, minus the cached loader
+    config = settings.TEMPLATES[0]
+    options = {**config.get('OPTIONS', {}), 'loaders': UNCACHED_LOADERS}
+    return type(engines.all()[0])({
+        'NAME': 'uncached', 'DIRS': config.get('DIRS', []), 'APP_DIRS': False, 'OPTIONS': options,
+    })
+
+
+class Command(BaseCommand):
+    help = (
+        "Render event cards with the configured template engine, with uncached loaders, and with the old "
+        "if/elif image chain in place of the sport registry, and report the cost per card."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=500, help="Cards rendered per round (default: 500).")
+        parser.add_argument('--rounds', type=int, default=5, help="Rounds per variant, the best is reported (default: 5).")
+
+    def handle(self, *args, **options):
+        events = sample_events(options['cards'])
+        user = AnonymousUser()
+        configured = engines.all()[0]
+        uncached = uncached_engine()
+        # Compiled once, as the cached loader would
+        chain = configured.from_string(CHAIN_CARD)
+
+        variants = (
+            # Look the template up per card, as render_to_string does
+            ('configured', lambda event: configured.get_template(CARD_TEMPLATE).render({'event': event, 'user': user})),
+            ('uncached', lambda event: uncached.get_template(CARD_TEMPLATE).render({'event': event, 'user': user})),
+            ('if/elif', lambda event: chain.render({'event': event, 'user': user})),
+        )
+        results = {}
+        for name, render in variants:
+            best = None
+            for _ in range(options['rounds']):
+                start = time.perf_counter()
+                for event in events:
+                    render(event)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = best / len(events) * 1e6
+            self.stdout.write(f"{name:<12} {results[name]:8.1f} us/card")
+
+        saved = 1 - results['configured'] / results['uncached']
+        self.stdout.write(self.style.SUCCESS(f"Configured engine is {saved:.0%} cheaper per card."))
+        saved = 1 - results['configured'] / results['if/elif']
+        self.stdout.write(self.style.SUCCESS(
+            f"Registry card is {saved:.0%} cheaper per card than the if/elif chain."
+            if saved >= 0 else f"Registry card is {-saved:.0%} more expensive per card than the if/elif chain."
+        ))
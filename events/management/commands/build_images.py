@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.images import FORMATS, WIDTHS, build_variants, remove_stale_variants
+
+
+class Command(BaseCommand):
+    help = "Build resized AVIF/WebP/JPEG variants of the sport artwork and their manifest (run before collectstatic)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--widths', type=int, nargs='+', default=list(WIDTHS),
+                            help=f"Variant widths in pixels (default: {' '.join(map(str, WIDTHS))}).")
+        parser.add_argument('--formats', nargs='+', choices=list(FORMATS), default=list(FORMATS),
+                            help="Formats to build (default: all the installed Pillow can encode).")
+        parser.add_argument('--clean', action='store_true',
+                            help="Delete variants left over from earlier builds.")
+
+    def handle(self, *args, **options):
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            raise CommandError("build_images needs Pillow: pip install Pillow")
+
+        manifest = build_variants(widths=sorted(options['widths']), formats=options['formats'])
+
+        for path, entry in manifest.items():
+            for fmt, variants in entry['variants'].items():
+                total = sum(variant['bytes'] for variant in variants)
+                self.stdout.write(f"{path} {fmt}: {len(variants)} sizes, {total // 1024} KB")
+        if options['clean']:
+            self.stdout.write(f"Removed {remove_stale_variants(manifest)} stale variants.")
+        self.stdout.write(self.style.SUCCESS(f"Built variants for {len(manifest)} images."))
@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from events.importer import READERS, import_events
+
+
+class Command(BaseCommand):
+    help = "Import events from a CSV or JSON Lines file, validating each row like the add event form."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--organizer', required=True,
+                            help="Username owning the events, unless a row has an 'organizer' column.")
+        parser.add_argument('--format', choices=sorted(READERS),
+                            help="File format, guessed from the extension by default.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--errors', help="Write rejected rows to this file instead of stderr.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in READERS:
+            raise CommandError("Cannot tell the file format, use --format csv or --format jsonl.")
+
+        organizer = User.objects.filter(username=options['organizer']).first()
+        if organizer is None:
+            raise CommandError(f"Unknown organizer '{options['organizer']}'.")
+
+        errors = open(options['errors'], 'w') if options['errors'] else None
+        out = errors or self.stderr
+
+        def on_error(line, message):
+            out.write(f"line {line}: {message}\n")
+
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as stream:
+                result = import_events(stream, file_format, organizer, options['batch_size'], on_error)
+        finally:
+            if errors:
+                errors.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {result.created} events, rejected {result.failed} rows."))
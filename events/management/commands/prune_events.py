@@ -0,0 +1,74 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from events.models import Event, EventParticipant, EventJoinInfo, ArchivedEvent, ArchivedParticipation
+
+
+class Command(BaseCommand):
+    help = "Move past events, their participants and join info into the archive tables in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help="Number of events archived per transaction (default: 200).")
+        parser.add_argument('--before', type=date.fromisoformat, default=None,
+                            help="Archive events dated before this day (YYYY-MM-DD, default: today).")
+
+    def handle(self, *args, **options):
+        cutoff = options['before'] or date.today()
+        batch_size = options['batch_size']
+
+        total = 0
+        while True:
+            archived = self.archive_batch(cutoff, batch_size)
+            if not archived:
+                break
+            total += archived
+            self.stdout.write(f"Archived {archived} events...")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} past events."))
+
+    @transaction.atomic
+    def archive_batch(self, cutoff, batch_size):
+        # Each batch is its own short transaction so readers are never
+        # blocked for longer than one batch takes.
+        events = list(Event.objects.filter(event_date__lt=cutoff).order_by('event_date', 'id')[:batch_size])
+        if not events:
+            return 0
+        event_ids = [event.id for event in events]
+
+        join_info = {
+            (info.event_id, info.user_id): info
+            for info in EventJoinInfo.objects.filter(event_id__in=event_ids)
+        }
+
+        ArchivedEvent.objects.bulk_create([
+            ArchivedEvent(
+                id=event.id,
+                event_name=event.event_name,
+                sport_type=event.sport_type,
+                event_date=event.event_date,
+                event_time=event.event_time,
+                event_location=event.event_location,
+                total_players=event.total_players,
+                organizer_id=event.organizer_id,
+            )
+            for event in events
+        ], ignore_conflicts=True)
+
+        participations = []
+        for participant in EventParticipant.objects.filter(event_id__in=event_ids):
+            info = join_info.get((participant.event_id, participant.user_id))
+            participations.append(ArchivedParticipation(
+                event_id=participant.event_id,
+                user_id=participant.user_id,
+                name=info.name if info else '',
+                email=info.email if info else '',
+                phone_number=info.phone_number if info else '',
+                joined_at=participant.joined_at,
+            ))
+        ArchivedParticipation.objects.bulk_create(participations)
+
+        Event.objects.filter(id__in=event_ids).delete()
+        return len(event_ids)
@@ -0,0 +1,88 @@
+import random
+from datetime import date, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from events.models import Event, UserProfile, EventParticipant, EventJoinInfo
+from events.sports import SPORTS
+
+CITIES = ['Ahmedabad', 'Mumbai', 'Pune', 'Surat', 'Bengaluru', 'Delhi', 'Jaipur', 'Chennai', 'Kolkata', 'Hyderabad']
+NAME_WORDS = ['Sunday', 'Morning', 'Evening', 'League', 'Cup', 'Open', 'Friendly', 'Challenge', 'Weekend', 'Community']
+
+# Every seeded user has this password, so benchmarks and manual testing
+# can log in as any of them
+SEED_PASSWORD = 'seedpass123'
+
+
+class Command(BaseCommand):
+    help = "Seed users, profiles, events and participations with bulk_create for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--events', type=int, default=5000)
+        parser.add_argument('--max-players', type=int, default=30,
+                            help="Upper bound for an event's total_players (default: 30).")
+        parser.add_argument('--fill', type=float, default=0.6,
+                            help="Average fraction of seats taken (default: 0.6).")
+        parser.add_argument('--days', type=int, default=90,
+                            help="Spread event dates over this many upcoming days (default: 90).")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for repeatable data sets.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        sports = [sport.label for sport in SPORTS]
+
+        with transaction.atomic():
+            prefix = f"seed{User.objects.count()}_"
+            password = make_password(SEED_PASSWORD)  # hash once, not once per user
+            users = User.objects.bulk_create([
+                User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", password=password)
+                for i in range(options['users'])
+            ], batch_size=batch_size)
+            UserProfile.objects.bulk_create([
+                UserProfile(user=user, sports_interested=rng.choice(sports), city=rng.choice(CITIES))
+                for user in users
+            ], batch_size=batch_size)
+            self.stdout.write(f"Created {len(users)} users with profiles.")
+
+            # Pick the players first so seats_taken is right from the start
+            events = []
+            players = []
+            for i in range(options['events']):
+                total_players = rng.randint(2, options['max_players'])
+                taken = min(int(total_players * rng.uniform(0, 2 * options['fill'])), total_players, len(users))
+                players.append(rng.sample(users, taken))
+                sport = rng.choice(sports)
+                city = rng.choice(CITIES)
+                events.append(Event(
+                    event_name=f"{city} {rng.choice(NAME_WORDS)} {sport} {i}",
+                    sport_type=sport,
+                    event_date=date.today() + timedelta(days=rng.randint(0, options['days'])),
+                    event_time=time(rng.randint(6, 21), rng.choice([0, 30])),
+                    event_location=city,
+                    total_players=total_players,
+                    organizer=rng.choice(users),
+                    event_description=f"Seeded {sport.lower()} event in {city}.",
+                    seats_taken=taken,
+                ))
+            events = Event.objects.bulk_create(events, batch_size=batch_size)
+            self.stdout.write(f"Created {len(events)} events.")
+
+            participants = []
+            join_info = []
+            for event, event_players in zip(events, players):
+                for user in event_players:
+                    participants.append(EventParticipant(event=event, user=user))
+                    join_info.append(EventJoinInfo(
+                        event=event, user=user, name=user.username, email=user.email, phone_number='9999999999',
+                    ))
+            EventParticipant.objects.bulk_create(participants, batch_size=batch_size)
+            EventJoinInfo.objects.bulk_create(join_info, batch_size=batch_size)
+            self.stdout.write(f"Created {len(participants)} participations.")
+
+        self.stdout.write(self.style.SUCCESS("Seeding complete."))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.outbox import claim_jobs, deliver
+
+
+class Command(BaseCommand):
+    help = "Deliver queued email jobs in batches, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--interval', type=float, default=5,
+                            help="Seconds to sleep when the queue is empty (default: 5).")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the due jobs and exit instead of polling forever (for cron).")
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = claim_jobs(options['batch_size'])
+            if jobs:
+                sent = deliver(jobs)
+                self.stdout.write(f"Sent {sent} of {len(jobs)} emails.")
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
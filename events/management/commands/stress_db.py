@@ -0,0 +1,108 @@
+import json
+import multiprocessing
+import random
+import time
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections, OperationalError
+
+from events.models import AlreadyJoinedError, Event, EventFullError
+
+from .benchmark import percentile
+
+
+def read(rng, event_ids, user_ids):
+    # The events page query
+    list(Event.objects.filter(event_date__gte=date.today()).order_by('event_date', 'id')[:20])
+
+
+def write(rng, event_ids, user_ids):
+    # A join, or a cancel when already joined, through the same code as the views
+    event = Event.objects.get(id=rng.choice(event_ids))
+    user = User(id=rng.choice(user_ids))
+    if not event.remove_participant(user):
+        try:
+            event.add_participant(user, 'Stress Test', 'stress@example.com', '0000000000')
+        except (AlreadyJoinedError, EventFullError):
+            pass
+
+
+def worker(seconds, write_ratio, seed, event_ids, user_ids, results):
+    rng = random.Random(seed)
+    stats = {'reads': [], 'writes': [], 'locked': 0, 'errors': 0}
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        kind = 'writes' if rng.random() < write_ratio else 'reads'
+        start = time.perf_counter()
+        try:
+            (write if kind == 'writes' else read)(rng, event_ids, user_ids)
+        except OperationalError as error:
+            stats['locked' if 'locked' in str(error) else 'errors'] += 1
+        else:
+            stats[kind].append((time.perf_counter() - start) * 1000)
+        # End of "request": closes the connection unless CONN_MAX_AGE keeps it
+        close_old_connections()
+    connections.close_all()
+    results.put(stats)
+
+
+class Command(BaseCommand):
+    help = "Hammer the SQLite database from several processes with event reads and join/cancel writes (use a throwaway copy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help="Worker processes (default: 4).")
+        parser.add_argument('--seconds', type=float, default=10, help="How long each worker runs (default: 10).")
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help="Fraction of operations that are writes (default: 0.2).")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+            raise CommandError("stress_db needs a file-based SQLite database.")
+        event_ids = list(Event.objects.filter(event_date__gte=date.today()).values_list('id', flat=True)[:2000])
+        user_ids = list(User.objects.values_list('id', flat=True)[:2000])
+        if not event_ids or not user_ids:
+            raise CommandError("No data to stress, run 'manage.py seed_data' first.")
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        # Children must open their own connections
+        connections.close_all()
+
+        results = multiprocessing.get_context('fork').Queue()
+        processes = [
+            multiprocessing.get_context('fork').Process(
+                target=worker,
+                args=(options['seconds'], options['write_ratio'], options['seed'] + i, event_ids, user_ids, results),
+            )
+            for i in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        stats = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        reads = [ms for stat in stats for ms in stat['reads']]
+        writes = [ms for stat in stats for ms in stat['writes']]
+        summary = {
+            'production_mode': settings.SQLITE_PRODUCTION,
+            'journal_mode': journal_mode,
+            'processes': options['processes'],
+            'seconds': options['seconds'],
+            'reads_per_second': round(len(reads) / options['seconds'], 1),
+            'writes_per_second': round(len(writes) / options['seconds'], 1),
+            'read_p95_ms': round(percentile(reads, 95), 2),
+            'write_p95_ms': round(percentile(writes, 95), 2),
+            'locked_errors': sum(stat['locked'] for stat in stats),
+            'other_errors': sum(stat['errors'] for stat in stats),
+        }
+        for key, value in summary.items():
+            self.stdout.write(f"{key:<18} {value}")
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(summary, f, indent=2)
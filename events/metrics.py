@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+# Per-process request metrics, exposed at /metrics in the Prometheus text
+# format. Each worker process keeps its own numbers, Prometheus sums them
+# when it scrapes every worker.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_QUERIES_LOGGED = 10
+
+_current_request = ContextVar('metrics_request', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = []  # (sql, seconds)
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            # Async views query from several worker threads at once
+            with self.lock:
+                self.db_time += duration
+                self.queries.append((sql, duration))
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # On every connection of every thread, so the queries async views run
+    # through sync_to_async and the async ORM are counted too: those run
+    # in worker threads with their own connections, but see the request's
+    # context variables.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+        self.cache = {}  # (cache name, 'hit' or 'miss') -> count
+
+    def record(self, view, latency, stats):
+        with self.lock:
+            metrics = self.views.get(view)
+            if metrics is None:
+                metrics = self.views[view] = ViewMetrics()
+            metrics.requests += 1
+            bucket = bisect_left(LATENCY_BUCKETS, latency)
+            if bucket < len(LATENCY_BUCKETS):
+                metrics.buckets[bucket] += 1
+            metrics.latency_sum += latency
+            metrics.queries += len(stats.queries)
+            metrics.db_time += stats.db_time
+            metrics.template_time += stats.template_time
+
+    def record_cache(self, name, hits, misses):
+        with self.lock:
+            self.cache[name, 'hit'] = self.cache.get((name, 'hit'), 0) + hits
+            self.cache[name, 'miss'] = self.cache.get((name, 'miss'), 0) + misses
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+            self.cache = {}
+
+    def render(self):
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = [
+                '# HELP sportarena_requests_total Requests handled, by view.',
+                '# TYPE sportarena_requests_total counter',
+            ]
+            lines += [f'sportarena_requests_total{{view="{view}"}} {m.requests}' for view, m in views]
+
+            lines += [
+                '# HELP sportarena_request_duration_seconds Request latency, by view.',
+                '# TYPE sportarena_request_duration_seconds histogram',
+            ]
+            for view, m in views:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, m.buckets):
+                    cumulative += count
+                    lines.append(f'sportarena_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+                lines.append(f'sportarena_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {m.requests}')
+                lines.append(f'sportarena_request_duration_seconds_sum{{view="{view}"}} {m.latency_sum:.6f}')
+                lines.append(f'sportarena_request_duration_seconds_count{{view="{view}"}} {m.requests}')
+
+            lines += [
+                '# HELP sportarena_db_queries_total Database queries run, by view.',
+                '# TYPE sportarena_db_queries_total counter',
+            ]
+            lines += [f'sportarena_db_queries_total{{view="{view}"}} {m.queries}' for view, m in views]
+
+            lines += [
+                '# HELP sportarena_db_duration_seconds_total Time spent in database queries, by view.',
+                '# TYPE sportarena_db_duration_seconds_total counter',
+            ]
+            lines += [f'sportarena_db_duration_seconds_total{{view="{view}"}} {m.db_time:.6f}' for view, m in views]
+
+            lines += [
+                '# HELP sportarena_template_duration_seconds_total Time spent rendering templates, by view.',
+                '# TYPE sportarena_template_duration_seconds_total counter',
+            ]
+            lines += [f'sportarena_template_duration_seconds_total{{view="{view}"}} {m.template_time:.6f}' for view, m in views]
+
+            lines += [
+                '# HELP sportarena_cache_requests_total Cache lookups, by cache and result.',
+                '# TYPE sportarena_cache_requests_total counter',
+            ]
+            lines += [
+                f'sportarena_cache_requests_total{{cache="{name}",result="{result}"}} {count}'
+                for (name, result), count in sorted(self.cache.items())
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Record latency, query count and DB/template time per resolved URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500) / 1000
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with self.measure(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with self.measure(request):
+            return await self.get_response(request)
+
+    @contextmanager
+    def measure(self, request):
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _current_request.reset(token)
+
+        latency = time.perf_counter() - start
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        registry.record(view, latency, stats)
+
+        if latency >= self.slow_threshold:
+            slowest = sorted(stats.queries, key=lambda query: query[1], reverse=True)[:SLOW_QUERIES_LOGGED]
+            logger.warning(
+                "Slow request %s %s (%s): %.0f ms, %d queries, %.0f ms in DB\n%s",
+                request.method, request.path, view, latency * 1000, len(stats.queries), stats.db_time * 1000,
+                '\n'.join(f'  {duration * 1000:.1f} ms  {sql}' for sql, duration in slowest),
+            )
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        stats = _current_request.get()
+        if stats is None:
+            return super().render(context, request)
+        # Includes queries run lazily from the template, those are also
+        # counted in the DB time
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend that reports render time to MetricsMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
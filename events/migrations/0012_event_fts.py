@@ -0,0 +1,63 @@
+from django.db import migrations
+
+
+# External-content FTS5 index over events_event. The triggers keep it in
+# sync for every write path, including bulk_create and raw SQL, which
+# model signals would miss.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE events_event_fts USING fts5(
+        event_name, event_location, sport_type, event_description,
+        content='events_event', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO events_event_fts(rowid, event_name, event_location, sport_type, event_description)
+        VALUES (new.id, new.event_name, new.event_location, new.sport_type, new.event_description);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, event_name, event_location, sport_type, event_description)
+        VALUES ('delete', old.id, old.event_name, old.event_location, old.sport_type, old.event_description);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_update AFTER UPDATE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, event_name, event_location, sport_type, event_description)
+        VALUES ('delete', old.id, old.event_name, old.event_location, old.sport_type, old.event_description);
+        INSERT INTO events_event_fts(rowid, event_name, event_location, sport_type, event_description)
+        VALUES (new.id, new.event_name, new.event_location, new.sport_type, new.event_description);
+    END
+    """,
+    "INSERT INTO events_event_fts(events_event_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS events_event_fts_update",
+    "DROP TRIGGER IF EXISTS events_event_fts_delete",
+    "DROP TRIGGER IF EXISTS events_event_fts_insert",
+    "DROP TABLE IF EXISTS events_event_fts",
+]
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        # Other databases use their own search backend, see events/search.py
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_archivedevent_archivedparticipation'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
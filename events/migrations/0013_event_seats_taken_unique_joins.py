@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+# The FTS triggers of migration 0012, copied here so this migration keeps
+# doing the same thing whatever happens to later code
+FTS_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO events_event_fts(rowid, event_name, event_location, sport_type, event_description)
+        VALUES (new.id, new.event_name, new.event_location, new.sport_type, new.event_description);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, event_name, event_location, sport_type, event_description)
+        VALUES ('delete', old.id, old.event_name, old.event_location, old.sport_type, old.event_description);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_update AFTER UPDATE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, event_name, event_location, sport_type, event_description)
+        VALUES ('delete', old.id, old.event_name, old.event_location, old.sport_type, old.event_description);
+        INSERT INTO events_event_fts(rowid, event_name, event_location, sport_type, event_description)
+        VALUES (new.id, new.event_name, new.event_location, new.sport_type, new.event_description);
+    END
+    """,
+]
+
+
+def reinstall_fts_triggers(apps, schema_editor):
+    # Adding seats_taken rebuilds events_event on SQLite, dropping its triggers
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name in ('insert', 'delete', 'update'):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS events_event_fts_{name}")
+    for statement in FTS_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+    schema_editor.execute("INSERT INTO events_event_fts(events_event_fts) VALUES ('rebuild')")
+
+
+def remove_duplicate_joins(apps, schema_editor):
+    # The old unique_together was never applied, so keep only the first
+    # row per (event, user) before adding the constraint
+    for model_name in ('EventParticipant', 'EventJoinInfo'):
+        model = apps.get_model('events', model_name)
+        duplicates = model.objects.values('event', 'user').annotate(first_id=Min('id'), rows=Count('id')).filter(rows__gt=1)
+        for duplicate in duplicates:
+            model.objects.filter(event=duplicate['event'], user=duplicate['user']).exclude(id=duplicate['first_id']).delete()
+
+
+def count_seats_taken(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventParticipant = apps.get_model('events', 'EventParticipant')
+    participants = EventParticipant.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(total=Count('id')).values('total')
+    Event.objects.update(seats_taken=Coalesce(Subquery(participants), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_event_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(reinstall_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(remove_duplicate_joins, migrations.RunPython.noop),
+        migrations.RunPython(count_seats_taken, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='eventjoininfo',
+            unique_together={('event', 'user')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventparticipant',
+            unique_together={('event', 'user')},
+        ),
+    ]
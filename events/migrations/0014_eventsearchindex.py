@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:50
+
+import django.db.models.deletion
+import events.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_event_seats_taken_unique_joins'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSearchIndex',
+            fields=[
+                ('event', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='events.event')),
+                ('document', events.models.FullTextField(db_column='events_event_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'events_event_fts',
+                'managed': False,
+            },
+        ),
+    ]
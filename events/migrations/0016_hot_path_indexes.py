@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_emailjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventparticipant',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'id'], name='event_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['sport_type', 'event_date'], name='event_sport_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'event_date'], name='event_organizer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['user', 'event'], name='participant_user_event_idx'),
+        ),
+    ]
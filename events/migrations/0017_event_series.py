@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='occurrence_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='EventSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_name', models.CharField(max_length=255)),
+                ('sport_type', models.CharField(max_length=100)),
+                ('event_time', models.TimeField()),
+                ('event_location', models.CharField(max_length=255)),
+                ('total_players', models.IntegerField()),
+                ('event_description', models.TextField(blank=True, null=True)),
+                ('frequency', models.CharField(choices=[('weekly', 'Weekly'), ('biweekly', 'Every two weeks'), ('monthly', 'Monthly')], default='weekly', max_length=10)),
+                ('start_date', models.DateField()),
+                ('until', models.DateField(blank=True, help_text='Last possible date, empty to repeat forever', null=True)),
+                ('skipped_dates', models.JSONField(blank=True, default=list)),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'event series',
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='events.eventseries'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(condition=models.Q(('series__isnull', False)), fields=('series', 'occurrence_date'), name='event_series_occurrence_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='eventseries',
+            index=models.Index(fields=['until'], name='series_until_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# Reindex an event only when one of the indexed columns changes, not on
+# every seats_taken update from a join
+
+UPDATE_TRIGGER_SQL = """
+    CREATE TRIGGER events_event_fts_update AFTER UPDATE OF event_name, event_location, sport_type, event_description ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, event_name, event_location, sport_type, event_description)
+        VALUES ('delete', old.id, old.event_name, old.event_location, old.sport_type, old.event_description);
+        INSERT INTO events_event_fts(rowid, event_name, event_location, sport_type, event_description)
+        VALUES (new.id, new.event_name, new.event_location, new.sport_type, new.event_description);
+    END
+"""
+
+OLD_UPDATE_TRIGGER_SQL = """
+    CREATE TRIGGER events_event_fts_update AFTER UPDATE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, event_name, event_location, sport_type, event_description)
+        VALUES ('delete', old.id, old.event_name, old.event_location, old.sport_type, old.event_description);
+        INSERT INTO events_event_fts(rowid, event_name, event_location, sport_type, event_description)
+        VALUES (new.id, new.event_name, new.event_location, new.sport_type, new.event_description);
+    END
+"""
+
+
+def replace_update_trigger(statement):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute("DROP TRIGGER IF EXISTS events_event_fts_update")
+        schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_event_series'),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_update_trigger(UPDATE_TRIGGER_SQL), replace_update_trigger(OLD_UPDATE_TRIGGER_SQL)),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def remove_orphaned_join_info(apps, schema_editor):
+    # Cancelling used to leave the join info behind. With the unique
+    # (event, user) constraint those rows would stop the user rejoining.
+    EventJoinInfo = apps.get_model('events', 'EventJoinInfo')
+    EventParticipant = apps.get_model('events', 'EventParticipant')
+    EventJoinInfo.objects.exclude(
+        Exists(EventParticipant.objects.filter(event=OuterRef('event'), user=OuterRef('user'))),
+    ).delete()
+
+
+def recount_seats_taken(apps, schema_editor):
+    # Participants removed by a user cascade or from the admin were never
+    # subtracted from seats_taken
+    Event = apps.get_model('events', 'Event')
+    EventParticipant = apps.get_model('events', 'EventParticipant')
+    participants = EventParticipant.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(total=Count('id')).values('total')
+    Event.objects.update(seats_taken=Coalesce(Subquery(participants), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_fts_update_trigger'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_orphaned_join_info, migrations.RunPython.noop),
+        migrations.RunPython(recount_seats_taken, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,21 @@
-from django.db import models
+import calendar
+from datetime import timedelta
+
+from django.db import models, transaction, IntegrityError
 from django.contrib.auth.models import User
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save
+from django.urls import reverse
+from django.utils import timezone
+
+
+class EventFullError(Exception):
+    pass
+
+
+class AlreadyJoinedError(Exception):
+    pass
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -20,16 +35,232 @@ class Event(models.Model):
     total_players = models.IntegerField()
     organizer = models.ForeignKey(User, on_delete=models.CASCADE)
     event_description = models.TextField(blank=True, null=True)
+    # Denormalized participant count, claimed by add_participant and
+    # recounted whenever participants are deleted (events/signals.py)
+    seats_taken = models.IntegerField(default=0)
+    # Set when this row is one occurrence of an EventSeries, which only gets
+    # a row once it has participants or changes of its own
+    series = models.ForeignKey('EventSeries', on_delete=models.CASCADE, null=True, blank=True, related_name='occurrences')
+    occurrence_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # One row per occurrence, concurrent first joins can't create two
+            models.UniqueConstraint(fields=['series', 'occurrence_date'], condition=Q(series__isnull=False),
+                                    name='event_series_occurrence_unique'),
+        ]
+        indexes = [
+            # Upcoming lists and keyset pagination: event_date >= today ORDER BY event_date, id
+            models.Index(fields=['event_date', 'id'], name='event_date_id_idx'),
+            # Sport filter on the API and admin, still in date order
+            models.Index(fields=['sport_type', 'event_date'], name='event_sport_date_idx'),
+            # Organizer's events in date order (dashboard, admin)
+            models.Index(fields=['organizer', 'event_date'], name='event_organizer_date_idx'),
+        ]
 
     # This is the required addition to fix the error
     def __str__(self):
         return f"{self.event_name} on {self.event_date}"
 
+    @property
+    def is_full(self):
+        return self.seats_taken >= self.total_players
+
+    def get_join_url(self):
+        if self.pk is None:
+            # A series occurrence without a row yet
+            return reverse('join_occurrence', args=[self.series_id, self.occurrence_date.isoformat()])
+        return reverse('join_event', args=[self.pk])
+
+    def add_participant(self, user, name, email, phone_number):
+        """Claim a seat and record the join in a single transaction.
+
+        Raises AlreadyJoinedError or EventFullError, in which case nothing
+        is written.
+        """
+        try:
+            with transaction.atomic():
+                # The unique (event, user) constraint rejects double joins
+                participant = EventParticipant.objects.create(event=self, user=user)
+
+                # Conditional increment: succeeds only while a seat is free,
+                # so concurrent joins can never oversell
+                claimed = Event.objects.filter(
+                    id=self.id, seats_taken__lt=F('total_players')
+                ).update(seats_taken=F('seats_taken') + 1)
+                if not claimed:
+                    raise EventFullError()
+
+                # A row left over from before cancelling removed join info
+                # must not stop the user from joining again
+                EventJoinInfo.objects.update_or_create(
+                    event=self, user=user, defaults={'name': name, 'email': email, 'phone_number': phone_number},
+                )
+        except IntegrityError:
+            raise AlreadyJoinedError()
+
+        self.seats_taken += 1
+        return participant
+
+    def remove_participant(self, user):
+        """Release the user's seat. Returns False if they had not joined."""
+        with transaction.atomic():
+            # The post_delete signal recounts seats_taken
+            deleted, _ = EventParticipant.objects.filter(event=self, user=user).delete()
+            if not deleted:
+                return False
+            EventJoinInfo.objects.filter(event=self, user=user).delete()
+
+        self.seats_taken -= 1
+        return True
+
+def recount_seats(event_ids):
+    """Set seats_taken of these events from their participant rows."""
+    with transaction.atomic():
+        # Wait for joins in flight, so the count below sees their rows
+        list(Event.objects.select_for_update().filter(id__in=event_ids).order_by('id').values_list('id'))
+        count = EventParticipant.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(n=Count('*')).values('n')
+        Event.objects.filter(id__in=event_ids).update(
+            seats_taken=Coalesce(Subquery(count, output_field=IntegerField()), Value(0)),
+        )
+
+
+class EventSeries(models.Model):
+    """An event that repeats, e.g. a weekly league.
+
+    Occurrences are not stored: dates() generates them for a date window
+    and occurrence() builds an unsaved Event for one of them. An occurrence
+    is saved as an Event (materialize) only when someone joins it or it is
+    changed on its own, so editing the series is a single row update.
+    """
+    WEEKLY = 'weekly'
+    BIWEEKLY = 'biweekly'
+    MONTHLY = 'monthly'
+    FREQUENCY_CHOICES = [(WEEKLY, 'Weekly'), (BIWEEKLY, 'Every two weeks'), (MONTHLY, 'Monthly')]
+
+    event_name = models.CharField(max_length=255)
+    sport_type = models.CharField(max_length=100)
+    event_time = models.TimeField()
+    event_location = models.CharField(max_length=255)
+    total_players = models.IntegerField()
+    organizer = models.ForeignKey(User, on_delete=models.CASCADE)
+    event_description = models.TextField(blank=True, null=True)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default=WEEKLY)
+    start_date = models.DateField()
+    until = models.DateField(null=True, blank=True, help_text="Last possible date, empty to repeat forever")
+    # Dates with no session (YYYY-MM-DD strings), like EXDATE in an RRULE
+    skipped_dates = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'event series'
+        indexes = [
+            # Series still running: until IS NULL OR until >= today
+            models.Index(fields=['until'], name='series_until_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} ({self.get_frequency_display().lower()} from {self.start_date})"
+
+    def _dates_from(self, start):
+        # Every date of the rule on or after start, without end
+        if self.frequency == self.MONTHLY:
+            # Same day of the month, months without that day are left out
+            year, month = start.year, start.month
+            while True:
+                if self.start_date.day <= calendar.monthrange(year, month)[1]:
+                    day = start.replace(year=year, month=month, day=self.start_date.day)
+                    if day >= start:
+                        yield day
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        else:
+            step = 7 if self.frequency == self.WEEKLY else 14
+            steps = -(-(start - self.start_date).days // step)  # rounded up
+            day = self.start_date + timedelta(days=steps * step)
+            while True:
+                yield day
+                day += timedelta(days=step)
+
+    def dates(self, start, end):
+        """Occurrence dates from start to end (inclusive), in order, generated lazily."""
+        start = max(start, self.start_date)
+        if self.until:
+            end = min(end, self.until)
+        skipped = set(self.skipped_dates)
+        for day in self._dates_from(start):
+            if day > end:
+                return
+            if day.isoformat() not in skipped:
+                yield day
+
+    def occurs_on(self, day):
+        return next(self.dates(day, day), None) is not None
+
+    def event_fields(self, day):
+        return {
+            'event_name': self.event_name,
+            'sport_type': self.sport_type,
+            'event_date': day,
+            'event_time': self.event_time,
+            'event_location': self.event_location,
+            'total_players': self.total_players,
+            'organizer_id': self.organizer_id,
+            'event_description': self.event_description,
+        }
+
+    def occurrence(self, day):
+        """The occurrence on ``day`` as an unsaved Event."""
+        return Event(series=self, occurrence_date=day, **self.event_fields(day))
+
+    def materialize(self, day):
+        """The Event row of the occurrence on ``day``, created on first use."""
+        event, _ = Event.objects.get_or_create(series=self, occurrence_date=day, defaults=self.event_fields(day))
+        return event
+
+    def skip(self, day):
+        """Cancel the session on ``day``, with its saved occurrence and participants if it has one."""
+        with transaction.atomic():
+            if day.isoformat() not in self.skipped_dates:
+                self.skipped_dates = sorted([*self.skipped_dates, day.isoformat()])
+                self.save(update_fields=['skipped_dates'])
+            self.occurrences.filter(occurrence_date=day).delete()
+
+    def update_occurrences(self, today):
+        """Bring the saved occurrences from ``today`` on in line with the series.
+
+        Call after changing it: they take its new details, and those whose
+        date it no longer has are deleted. Past sessions are left as they were.
+        """
+        with transaction.atomic():
+            for event in self.occurrences.filter(occurrence_date__gte=today):
+                if not self.occurs_on(event.occurrence_date):
+                    event.delete()
+                    continue
+                for field, value in self.event_fields(event.occurrence_date).items():
+                    setattr(event, field, value)
+                event.save()
+
+    def end(self, today):
+        """Stop the series before ``today``, cancelling its upcoming sessions."""
+        with transaction.atomic():
+            self.until = today - timedelta(days=1)
+            self.save(update_fields=['until'])
+            self.update_occurrences(today)
+
+
 class EventParticipant(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='participants')
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Indexed together with event below
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     joined_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        unique_together = ('event', 'user')
+        indexes = [
+            # A user's joined events, and "has this user joined" checks,
+            # answered from the index alone
+            models.Index(fields=['user', 'event'], name='participant_user_event_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} joined {self.event.event_name}"
 
@@ -42,13 +273,42 @@ class EventJoinInfo(models.Model):
     phone_number = models.CharField(max_length=15)
     joined_at = models.DateTimeField(auto_now_add=True)
 
-class Meta:
-    unique_together = ('event', 'user')
+    class Meta:
+        unique_together = ('event', 'user')
 
     def __str__(self):
         return f"{self.user.username} joined {self.event}"
 
 
+class FullTextField(models.TextField):
+    pass
+
+
+@FullTextField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+# The SQLite FTS5 index over events_event (see events/search.py). It is
+# created and filled by SQL in the migrations, this model only lets the ORM
+# join it: Event.objects.filter(search_index__document__match='"foot"*')
+class EventSearchIndex(models.Model):
+    event = models.OneToOneField(Event, on_delete=models.DO_NOTHING, primary_key=True,
+                                 db_column='rowid', db_constraint=False, related_name='search_index')
+    # FTS5 exposes a hidden column named after the table for MATCH queries
+    document = FullTextField(db_column='events_event_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'events_event_fts'
+
+
 class ContactMessage(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField()
@@ -59,3 +319,59 @@ class ContactMessage(models.Model):
         return f"{self.name} - {self.email}"
 
 
+class EmailJob(models.Model):
+    """Outgoing email waiting for the send_queued_email worker."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.TextField(help_text="Comma separated addresses")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Set while a worker holds the job, expired claims are picked up again
+    claimed_by = models.CharField(max_length=32, blank=True)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+
+# Archive of past events, filled in batches by the prune_events command.
+# Rows keep the original event id as their primary key so history can be
+# traced back, and join info is folded into the participation row.
+class ArchivedEvent(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    event_name = models.CharField(max_length=255)
+    sport_type = models.CharField(max_length=100)
+    event_date = models.DateField()
+    event_time = models.TimeField()
+    event_location = models.CharField(max_length=255)
+    total_players = models.IntegerField()
+    organizer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.event_name} on {self.event_date} (archived)"
+
+
+class ArchivedParticipation(models.Model):
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='participants')
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100, blank=True)
+    email = models.EmailField(blank=True)
+    phone_number = models.CharField(max_length=15, blank=True)
+    joined_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user.username} joined {self.event.event_name}"
@@ -0,0 +1,99 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EmailJob
+
+logger = logging.getLogger(__name__)
+
+# Email is never sent inside a request: views enqueue an EmailJob and the
+# send_queued_email worker delivers it in batches over one connection,
+# retrying failures with exponential backoff.
+
+MAX_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 60
+CLAIM_SECONDS = 300
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    return EmailJob.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=','.join(recipients),
+    )
+
+
+def claim_jobs(batch_size):
+    """Claim up to batch_size due jobs for this worker and return them.
+
+    The claim is a conditional UPDATE, so two workers never get the same
+    job even on databases without SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = Q(status=EmailJob.PENDING, next_attempt_at__lte=now) & (
+        Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+    )
+    with transaction.atomic():
+        ids = list(EmailJob.objects.filter(due).order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size])
+        EmailJob.objects.filter(due, id__in=ids).update(
+            claimed_by=token, claimed_until=now + timedelta(seconds=CLAIM_SECONDS),
+        )
+    return list(EmailJob.objects.filter(claimed_by=token).order_by('id'))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def deliver(jobs):
+    """Send claimed jobs over a single connection. Returns the number sent."""
+    if not jobs:
+        return 0
+
+    sent = 0
+    connection = get_connection()
+    try:
+        connection.open()
+        for job in jobs:
+            message = EmailMessage(
+                subject=job.subject, body=job.body, from_email=job.from_email,
+                to=job.recipients.split(','), connection=connection,
+            )
+            job.attempts += 1
+            job.claimed_by = ''
+            job.claimed_until = None
+            try:
+                connection.send_messages([message])
+            except Exception as error:
+                logger.warning("Sending email job %s failed (attempt %s): %s", job.id, job.attempts, error)
+                job.last_error = str(error)
+                if job.attempts >= MAX_ATTEMPTS:
+                    job.status = EmailJob.FAILED
+                else:
+                    job.next_attempt_at = timezone.now() + retry_delay(job.attempts)
+            else:
+                job.status = EmailJob.SENT
+                job.sent_at = timezone.now()
+                sent += 1
+            job.save(update_fields=[
+                'attempts', 'status', 'next_attempt_at', 'claimed_by', 'claimed_until', 'last_error', 'sent_at',
+            ])
+    except Exception as error:
+        # Could not connect at all: release the unsent jobs for a later retry
+        logger.warning("Email connection failed: %s", error)
+        unsent = [job.id for job in jobs if job.claimed_by]
+        EmailJob.objects.filter(id__in=unsent).update(
+            claimed_by='', claimed_until=None, last_error=str(error),
+            next_attempt_at=timezone.now() + retry_delay(1),
+        )
+    finally:
+        connection.close()
+    return sent
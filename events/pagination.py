@@ -0,0 +1,94 @@
+from datetime import date
+
+from django.db.models import Q
+
+
+# Keyset (cursor) pagination.
+# A cursor points at the last event of the previous page, so every page is
+# a single indexed range scan instead of an OFFSET that gets slower the
+# deeper you go.
+#
+# Date ordered lists use cursors like "2025-09-20.42" (event_date, id).
+# Search results ordered by relevance use "-1.75_42" (search_rank, id).
+
+def encode_cursor(event):
+    return f"{event.event_date.isoformat()}.{event.id}"
+
+
+def decode_cursor(cursor):
+    try:
+        event_date, event_id = cursor.split('.', 1)
+        return date.fromisoformat(event_date), int(event_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def encode_rank_cursor(event):
+    return f"{event.search_rank!r}_{event.id}"
+
+
+def decode_rank_cursor(cursor):
+    try:
+        rank, event_id = cursor.rsplit('_', 1)
+        return float(rank), int(event_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _page(rows, page_size, encode):
+    # One extra row was fetched to know whether there is a next page
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode(rows[-1])
+    return rows, next_cursor
+
+
+def events_after(queryset, cursor):
+    """Order by (event_date, id) and start after ``cursor``."""
+    queryset = queryset.order_by('event_date', 'id')
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        event_date, event_id = position
+        queryset = queryset.filter(
+            Q(event_date__gt=event_date) | Q(event_date=event_date, id__gt=event_id)
+        )
+    return queryset
+
+
+def ranked_after(queryset, cursor):
+    """Order search results by (search_rank, id) and start after ``cursor``."""
+    queryset = queryset.order_by('search_rank', 'id')
+
+    position = decode_rank_cursor(cursor) if cursor else None
+    if position:
+        rank, event_id = position
+        queryset = queryset.filter(
+            Q(search_rank__gt=rank) | Q(search_rank=rank, id__gt=event_id)
+        )
+    return queryset
+
+
+def paginate_events(queryset, cursor, page_size):
+    """Return (events, next_cursor) for the page after ``cursor``."""
+    rows = list(events_after(queryset, cursor)[:page_size + 1])
+    return _page(rows, page_size, encode_cursor)
+
+
+def paginate_ranked(queryset, cursor, page_size):
+    """Like paginate_events, for search results annotated with ``search_rank``."""
+    rows = list(ranked_after(queryset, cursor)[:page_size + 1])
+    return _page(rows, page_size, encode_rank_cursor)
+
+
+async def apaginate_events(queryset, cursor, page_size):
+    """paginate_events for async views."""
+    rows = [event async for event in events_after(queryset, cursor)[:page_size + 1].aiterator()]
+    return _page(rows, page_size, encode_cursor)
+
+
+async def apaginate_ranked(queryset, cursor, page_size):
+    """paginate_ranked for async views."""
+    rows = [event async for event in ranked_after(queryset, cursor)[:page_size + 1].aiterator()]
+    return _page(rows, page_size, encode_rank_cursor)
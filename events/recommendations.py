@@ -0,0 +1,118 @@
+import time
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Case, Count, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Least
+
+from .metrics import registry
+from .auth import get_profile
+from .fragments import get_versions
+from .models import Event, EventParticipant, ArchivedParticipation
+
+# "Events for you": upcoming events scored by how well they fit a user.
+# The whole candidate set is scored by the database in one query, and each
+# user's top N is cached until something relevant to them changes:
+#  - an event on the list changes (its card version in events/fragments.py),
+#  - an event of the user's favourite sport is added or changed (one
+#    version per sport, so a new football match leaves tennis players'
+#    lists alone),
+#  - the user joins or leaves an event, or edits their profile.
+# Other changes, such as a new event in the user's city for another sport,
+# reach the list when it expires after RECOMMENDATION_TIMEOUT.
+
+RECOMMENDATION_COUNT = 6
+RECOMMENDATION_TIMEOUT = 60 * 10  # also bounds staleness of seat availability
+
+SPORT_WEIGHT = 3.0
+CITY_WEIGHT = 2.0
+AVAILABILITY_WEIGHT = 1.0
+PEER_WEIGHT = 0.5
+MAX_PEERS_COUNTED = 4
+
+
+def score_events(user, limit=RECOMMENDATION_COUNT):
+    profile = get_profile(user)
+
+    # People the user has played with, in current and archived events
+    peers = EventParticipant.objects.filter(
+        event__in=EventParticipant.objects.filter(user=user).values('event')
+    ).exclude(user=user).values('user')
+    archived_peers = ArchivedParticipation.objects.filter(
+        event__in=ArchivedParticipation.objects.filter(user=user).values('event')
+    ).exclude(user=user).values('user')
+
+    candidates = Event.objects.filter(
+        event_date__gte=date.today(), seats_taken__lt=F('total_players'),
+    ).exclude(organizer=user).exclude(participants__user=user)
+
+    sport_match = Value(0.0)
+    city_match = Value(0.0)
+    if profile and profile.sports_interested:
+        sport_match = Case(When(sport_type=profile.sports_interested, then=Value(SPORT_WEIGHT)), default=Value(0.0))
+    if profile and profile.city:
+        city_match = Case(When(event_location__icontains=profile.city, then=Value(CITY_WEIGHT)), default=Value(0.0))
+
+    return list(candidates.annotate(
+        peer_count=Count('participants', filter=Q(participants__user__in=peers) | Q(participants__user__in=archived_peers)),
+        score=Cast(
+            sport_match
+            + city_match
+            + AVAILABILITY_WEIGHT * Cast(F('total_players') - F('seats_taken'), FloatField()) / F('total_players')
+            + PEER_WEIGHT * Least(F('peer_count'), MAX_PEERS_COUNTED),
+            FloatField(),
+        ),
+    ).order_by('-score', 'event_date', 'id')[:limit])
+
+
+def user_key(user_id):
+    return f'recommendations:{user_id}'
+
+
+def sport_key(sport):
+    # Users without a favourite sport share the '' bucket
+    return f'recommendations-version:{(sport or "").strip().lower()}'
+
+
+def sport_version(sport):
+    version = cache.get(sport_key(sport))
+    if version is None:
+        version = time.time_ns()
+        cache.add(sport_key(sport), version, None)
+        version = cache.get(sport_key(sport), version)
+    return version
+
+
+def recommended_events(user):
+    """The user's top events, recomputed only when stale."""
+    profile = get_profile(user)
+    sport, city = (profile.sports_interested, profile.city) if profile else ('', '')
+    stamp = (sport, city, sport_version(sport), date.today())
+    cached = cache.get(user_key(user.id))
+    if cached is not None and cached[0] == stamp:
+        events, versions = cached[1], cached[2]
+        if get_versions([event.id for event in events]) == versions:
+            registry.record_cache('recommendations', hits=1, misses=0)
+            return events
+
+    registry.record_cache('recommendations', hits=0, misses=1)
+    events = score_events(user)
+    versions = get_versions([event.id for event in events])
+    cache.set(user_key(user.id), (stamp, events, versions), RECOMMENDATION_TIMEOUT)
+    return events
+
+
+def events_changed(sports):
+    """Refresh the lists of users whose favourite sport is one of these.
+
+    Call when events of these sports were added or edited. Lists holding a
+    changed event are refreshed through its card version anyway.
+    """
+    now = time.time_ns()
+    # Users without a favourite can get any sport
+    cache.set_many({sport_key(sport): now for sport in {*sports, ''}}, None)
+
+
+def participation_changed(user_ids):
+    # Only these users' joined sets and peers changed, others keep their lists
+    cache.delete_many([user_key(user_id) for user_id in user_ids])
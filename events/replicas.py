@@ -0,0 +1,110 @@
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Read replicas. Only views marked @use_replica read from a replica, and
+# only for GET/HEAD requests from clients that haven't written anything in
+# the last REPLICA_PIN_SECONDS. Everything else (writes, transactions,
+# read-after-write pages such as join_event and dashboard) uses the primary.
+
+PIN_COOKIE = 'db_primary_until'
+
+# Apps whose tables are read from replicas and whose writes pin the client.
+# The cache table (DatabaseCache) and sessions always use the primary: a
+# lagging replica would serve stale cache versions and change markers, and
+# a cache miss is not a write the client needs to read back.
+REPLICATED_APPS = {'events', 'auth'}
+
+# Routing state of the current request. A dict rather than flags so changes
+# made in process_view or the router are seen by the middleware even when
+# they run in a copy of the context.
+request_state = ContextVar('replica_request_state', default=None)
+
+
+def use_replica(view):
+    """Mark a read-only view whose queries may go to a replica."""
+    view.use_replica = True
+    return view
+
+
+def pinned_to_primary(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = {'replica': False, 'wrote': False}
+        token = request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_state.reset(token)
+        return self.pin_after_write(state, response)
+
+    async def __acall__(self, request):
+        state = {'replica': False, 'wrote': False}
+        token = request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_state.reset(token)
+        return self.pin_after_write(state, response)
+
+    def pin_after_write(self, state, response):
+        if state['wrote'] and settings.DATABASE_REPLICAS:
+            # Stay on the primary until the replicas have caught up
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE, str(time.time() + pin_seconds), max_age=pin_seconds, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = request_state.get()
+        if (state is not None and getattr(view_func, 'use_replica', False)
+                and request.method in ('GET', 'HEAD') and not pinned_to_primary(request)):
+            state['replica'] = True
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = request_state.get()
+        if not replicas or not state or not state['replica'] or model._meta.app_label not in REPLICATED_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a transaction must see its own writes
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = request_state.get()
+        if state is not None and model._meta.app_label in REPLICATED_APPS:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get their schema from the primary
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,106 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q, FloatField, Value
+from django.utils.module_loading import import_string
+
+
+SEARCH_FIELDS = ('event_name', 'event_location', 'sport_type', 'event_description')
+
+# Every backend annotates matches with ``search_rank`` where a lower value
+# means a better match, so callers can order and paginate the same way
+# whichever database is behind it.
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text or '')
+
+
+def no_results(queryset):
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+
+class BasicSearchBackend:
+    """Unindexed fallback that works on any database."""
+
+    def search(self, queryset, text):
+        terms = search_terms(text)
+        if not terms:
+            return no_results(queryset)
+
+        for term in terms:
+            match = Q()
+            for field in SEARCH_FIELDS:
+                match |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(match)
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend:
+    """Ranked prefix search over the events_event_fts virtual table.
+
+    The table and the triggers that keep it in sync with events_event are
+    created in migration 0012. SQLite drops the triggers whenever a
+    migration rebuilds events_event, such migrations recreate them.
+    Results come from a join on the index, FTS5's rank column is bm25() so
+    better matches have lower values.
+    """
+
+    def match_expression(self, text):
+        # Quote each word so user input can't inject FTS5 syntax, and add *
+        # for prefix matching: "foot" finds "football".
+        return ' '.join(f'"{term}"*' for term in search_terms(text))
+
+    def search(self, queryset, text):
+        match = self.match_expression(text)
+        if not match:
+            return no_results(queryset)
+
+        return queryset.filter(search_index__document__match=match).annotate(
+            search_rank=F('search_index__rank'),
+        )
+
+
+class PostgresSearchBackend:
+    """Ranked prefix search using PostgreSQL's built-in full-text search.
+
+    Add a GIN index on the same SearchVector for large tables.
+    """
+
+    def search(self, queryset, text):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        terms = search_terms(text)
+        if not terms:
+            return no_results(queryset)
+
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw')
+        vector = SearchVector(*SEARCH_FIELDS)
+        return queryset.annotate(
+            search=vector,
+            search_rank=-SearchRank(vector, query),
+        ).filter(search=query)
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Return the backend named by EVENT_SEARCH_BACKEND, or one matching the database."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'EVENT_SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == 'sqlite':
+            _backend = SQLiteFTS5Backend()
+        elif connection.vendor == 'postgresql':
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = BasicSearchBackend()
+    return _backend
+
+
+def search_events(queryset, text):
+    return get_search_backend().search(queryset, text)
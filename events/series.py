@@ -0,0 +1,138 @@
+import heapq
+from datetime import date, timedelta
+from itertools import islice
+
+from .models import Event
+from .pagination import decode_cursor, encode_cursor, events_after
+from .search import SEARCH_FIELDS, search_terms
+
+# Event lists with the occurrences of recurring series (EventSeries) merged
+# in. Occurrences without a row are generated for the page's date window
+# only, so a series costs one row however long it runs.
+#
+# Lists are ordered by (date, 0, event id) for Event rows and (date, 1,
+# series id) for generated occurrences: on the same day one-off events come
+# first. Cursors of generated occurrences look like "2025-09-20.s7".
+
+SERIES_HORIZON_DAYS = 90  # How far ahead generated occurrences are listed
+EVENT, OCCURRENCE = 0, 1
+
+
+def encode_position(event):
+    if event.pk is None:
+        return f"{event.event_date.isoformat()}.s{event.series_id}"
+    return encode_cursor(event)
+
+
+def decode_position(cursor):
+    """(date, EVENT or OCCURRENCE, id) of a cursor, or None."""
+    if cursor and '.s' in cursor:
+        position = decode_cursor(cursor.replace('.s', '.', 1))
+        return (position[0], OCCURRENCE, position[1]) if position else None
+    position = decode_cursor(cursor) if cursor else None
+    return (position[0], EVENT, position[1]) if position else None
+
+
+def position_key(event):
+    if event.pk is None:
+        return event.event_date, OCCURRENCE, event.series_id
+    return event.event_date, EVENT, event.pk
+
+
+def events_page_query(events, cursor, page_size):
+    """The Event rows that can be on the page after ``cursor``."""
+    position = decode_position(cursor)
+    if position and position[1] == OCCURRENCE:
+        # Events of that day sort before its occurrences, they were listed
+        events = events.order_by('event_date', 'id').filter(event_date__gt=position[0])
+    else:
+        events = events_after(events, cursor)
+    return events[:page_size + 1]
+
+
+def occurrence_window(cursor, rows, page_size, today):
+    """First and last date the page can take generated occurrences from."""
+    position = decode_position(cursor)
+    start = max(position[0], today) if position else today
+    end = today + timedelta(days=SERIES_HORIZON_DAYS)
+    if len(rows) > page_size:
+        # The page can't go past its last Event row
+        end = min(end, rows[-1].event_date)
+    return start, end
+
+
+def in_window(series_list, start, end):
+    return [series for series in series_list if series.start_date <= end and (series.until is None or series.until >= start)]
+
+
+def saved_occurrences(series_list, start, end):
+    """(series id, date) of the occurrences in the window that have an Event row."""
+    return Event.objects.filter(
+        series__in=[series.id for series in series_list], occurrence_date__range=(start, end),
+    ).values_list('series_id', 'occurrence_date')
+
+
+def merge_page(rows, series_list, saved, cursor, start, end, page_size):
+    """Merge Event rows with the generated occurrences, return (page, next_cursor)."""
+    position = decode_position(cursor)
+    saved = set(saved)
+
+    def occurrences(series):
+        for day in series.dates(start, end):
+            # A saved occurrence is listed as its Event row, on its own date
+            if (series.id, day) not in saved and (position is None or (day, OCCURRENCE, series.id) > position):
+                yield series.occurrence(day)
+
+    merged = heapq.merge(rows, *(occurrences(series) for series in series_list), key=position_key)
+    page = list(islice(merged, page_size + 1))
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        next_cursor = encode_position(page[-1])
+    return page, next_cursor
+
+
+def paginate_with_series(events, series_list, cursor, page_size):
+    """Like paginate_events, with the occurrences of the series merged in date order."""
+    rows = list(events_page_query(events, cursor, page_size))
+    start, end = occurrence_window(cursor, rows, page_size, date.today())
+    series_list = in_window(series_list, start, end)
+    saved = saved_occurrences(series_list, start, end) if series_list else []
+    return merge_page(rows, series_list, saved, cursor, start, end, page_size)
+
+
+async def apaginate_with_series(events, series_list, cursor, page_size):
+    """paginate_with_series for async views."""
+    rows = [event async for event in events_page_query(events, cursor, page_size).aiterator()]
+    start, end = occurrence_window(cursor, rows, page_size, date.today())
+    series_list = in_window(series_list, start, end)
+    saved = [pair async for pair in saved_occurrences(series_list, start, end).aiterator()] if series_list else []
+    return merge_page(rows, series_list, saved, cursor, start, end, page_size)
+
+
+def search_series(series_list, text):
+    """The series matching every search term in any of SEARCH_FIELDS.
+
+    Matched in Python over the cached list of active series, which is short.
+    """
+    terms = [term.lower() for term in search_terms(text)]
+
+    def matches(series):
+        document = ' '.join(str(getattr(series, field) or '') for field in SEARCH_FIELDS).lower()
+        return all(term in document for term in terms)
+
+    return [series for series in series_list if terms and matches(series)]
+
+
+def next_occurrences(series_list, limit):
+    """The next generated occurrence of each series, soonest first."""
+    today = date.today()
+    end = today + timedelta(days=SERIES_HORIZON_DAYS)
+    series_list = in_window(series_list, today, end)
+    saved = set(saved_occurrences(series_list, today, end)) if series_list else set()
+    upcoming = []
+    for series in series_list:
+        day = next((day for day in series.dates(today, end) if (series.id, day) not in saved), None)
+        if day is not None:
+            upcoming.append(series.occurrence(day))
+    return sorted(upcoming, key=position_key)[:limit]
@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .auth import forget_user
+from .caching import invalidate_home, touch_events
+from .calendar import calendar_changed, event_changed as calendar_event_changed
+from .fragments import bump_event_version, series_version_id
+from .live import publish_seats
+from . import recommendations
+from .models import Event, EventParticipant, EventSeries, UserProfile, recount_seats
+
+
+# Bump after commit so a request can't cache the old data under the new
+# version while the transaction is still open
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_event_version(instance.id))
+    transaction.on_commit(touch_events)
+    transaction.on_commit(lambda: recommendations.events_changed([instance.sport_type]))
+    transaction.on_commit(lambda: calendar_event_changed(instance))
+    # total_players may have changed. robust: a failed push is logged, it
+    # must not turn the committed change into an error for the user
+    transaction.on_commit(lambda: publish_seats(instance.id), robust=True)
+
+
+@receiver(post_save, sender=EventParticipant)
+@receiver(post_delete, sender=EventParticipant)
+def participants_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_event_version(instance.event_id))
+    transaction.on_commit(touch_events)
+    transaction.on_commit(lambda: recommendations.participation_changed([instance.user_id]))
+    transaction.on_commit(lambda: calendar_changed([instance.user_id]))
+    transaction.on_commit(lambda: publish_seats(instance.event_id), robust=True)
+
+
+@receiver(post_delete, sender=EventParticipant)
+def seat_released(sender, instance, origin=None, **kwargs):
+    # Recounted rather than decremented, so cascades from a deleted User and
+    # deletes from the admin keep seats_taken right too
+    if isinstance(origin, Event) or getattr(origin, 'model', None) is Event:
+        return  # The event itself is being deleted
+    recount_seats([instance.event_id])
+
+
+@receiver(post_save, sender=EventSeries)
+@receiver(post_delete, sender=EventSeries)
+def series_changed(sender, instance, **kwargs):
+    # Cards of its sessions without a row, and the lists they are on
+    transaction.on_commit(lambda: bump_event_version(series_version_id(instance.id)))
+    transaction.on_commit(touch_events)
+    transaction.on_commit(invalidate_home)
+    transaction.on_commit(lambda: calendar_changed([instance.organizer_id]))
+
+
+# Forget the cached user right away, so this request never sees the old
+# copy, and again after commit in case another request cached it meanwhile
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.id)
+    transaction.on_commit(lambda: forget_user(instance.id))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    forget_user(instance.user_id)
+    transaction.on_commit(lambda: forget_user(instance.user_id))
@@ -0,0 +1,40 @@
+from typing import NamedTuple
+
+# The one place sports are defined. Forms take their choices from here,
+# templates look sports up through {% sport %} / {% sport_picture %}
+# (events/templatetags), and the artwork pipeline in events/images.py
+# builds variants of each sport's image. Built once at import time.
+
+IMAGES_DIR = 'events/images'
+
+
+class Sport(NamedTuple):
+    label: str
+    slug: str
+    color: str
+
+    @property
+    def image(self):
+        return f'{IMAGES_DIR}/{self.slug}.jpg'
+
+
+SPORTS = (
+    Sport('Football', 'football', '#2e7d32'),
+    Sport('Cricket', 'cricket', '#1565c0'),
+    Sport('Badminton', 'badminton', '#f9a825'),
+    Sport('Basketball', 'basketball', '#e65100'),
+    Sport('Tennis', 'tennis', '#9e9d24'),
+    Sport('Volleyball', 'volleyball', '#6a1b9a'),
+    Sport('Table Tennis', 'tabletennis', '#c62828'),
+    Sport('Running', 'running', '#00838f'),
+)
+
+# Events imported or created before a sport was retired still render
+OTHER_SPORT = Sport('Other', 'bg2', '#546e7a')
+
+SPORTS_BY_LABEL = {sport.label: sport for sport in SPORTS}
+SPORT_CHOICES = [(sport.label, sport.label) for sport in SPORTS]
+
+
+def get_sport(label):
+    return SPORTS_BY_LABEL.get(label, OTHER_SPORT)
@@ -0,0 +1,56 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from ..images import FORMATS, load_manifest
+from ..sports import get_sport
+
+register = template.Library()
+
+# Cards are at most ~400px wide on desktop and full width on phones
+DEFAULT_SIZES = '(max-width: 600px) 100vw, 400px'
+
+
+def srcset(variants):
+    return ', '.join(f"{static(variant['path'])} {variant['width']}w" for variant in variants)
+
+
+@register.simple_tag
+def responsive_image(path, alt='', sizes=DEFAULT_SIZES, loading='lazy'):
+    """<picture> with AVIF/WebP/JPEG srcsets for a built image, else a plain lazy <img>.
+
+    Usage: {% responsive_image 'events/images/football.jpg' 'Football' %}
+    """
+    entry = load_manifest().get(path)
+    if not entry:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async">', static(path), alt, loading,
+        )
+
+    variants = entry['variants']
+    fallback = variants.get('jpeg') or next(iter(variants.values()))
+    # Width and height let the browser reserve space before the image loads
+    largest = fallback[-1]
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((FORMATS[fmt]['mime'], srcset(variants[fmt]), sizes) for fmt in FORMATS if fmt != 'jpeg' and variants.get(fmt)),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" loading="{}" decoding="async"></picture>',
+        sources, static(largest['path']), srcset(fallback), sizes, largest['width'], largest['height'], alt, loading,
+    )
+
+
+@register.simple_tag
+def sport(label):
+    """The registry entry (label, slug, color, image) for a sport.
+
+    Usage: {% sport event.sport_type as sport %}
+    """
+    return get_sport(label)
+
+
+@register.simple_tag
+def sport_picture(sport_type, alt='', sizes=DEFAULT_SIZES, loading='lazy'):
+    """Usage: {% sport_picture event.sport_type event.sport_type %}"""
+    return responsive_image(get_sport(sport_type).image, alt, sizes, loading)
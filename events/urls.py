@@ -1,17 +1,30 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 from django.contrib.auth import views as auth_views
 
+# Async versions of the read views under ASGI, see events/async_views.py
+read_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('events/', views.events, name='events'),
+    path('', read_views.home, name='home'),
+    path('events/', read_views.events, name='events'),
+    path('events/live/', views.live_seats, name='live_seats'),
     path('add_events/', views.add_events, name='add_events'),
     path('contact/', views.contact, name='contact'),
     path('register/', views.register, name='register'),
     path('user_login/', views.user_login, name='user_login'),
     path('join_event/<int:event_id>/', views.join_event, name='join_event'),
+    path('join_event/<int:series_id>/<str:occurrence_date>/', views.join_occurrence, name='join_occurrence'),
     path('edit_event/<int:event_id>/', views.edit_event, name='edit_event'),
     path('delete_event/<int:event_id>/', views.delete_event, name='delete_event'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('edit_series/<int:series_id>/', views.edit_series, name='edit_series'),
+    path('skip_session/<int:series_id>/<str:occurrence_date>/', views.skip_session, name='skip_session'),
+    path('end_series/<int:series_id>/', views.end_series, name='end_series'),
+    path('dashboard/', read_views.dashboard, name='dashboard'),
     path('cancel_joined_event/<int:event_id>/', views.cancel_joined_event, name='cancel_joined_event'),
+    path('export_roster/<int:event_id>/', views.export_roster, name='export_roster'),
+    path('metrics', views.metrics, name='metrics'),
+    path('api/events/', read_views.api_events, name='api_events'),
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
 ]
@@ -1,89 +1,294 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth import login
-from .forms import EventForm, RegisterForm, LoginForm, EventJoinForm, ContactForm
-from .models import Event, UserProfile, EventParticipant, EventJoinInfo, ContactMessage
+from .forms import EventForm, NewEventForm, SeriesForm, RegisterForm, LoginForm, EventJoinForm
+from .models import Event, EventSeries, UserProfile, EventParticipant, EventJoinInfo, ContactMessage, ArchivedParticipation, AlreadyJoinedError, EventFullError
 from django.contrib.auth.decorators import login_required
-from datetime import date
-from django.db.models import Q 
-from django.core.mail import send_mail
+import csv
+import hashlib
+import hmac
+from datetime import date, timedelta
+from itertools import islice
+from django.db import transaction
+from django.db.models import OuterRef, Prefetch, Subquery
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
+from django.template.loader import render_to_string
+from .pagination import paginate_events, paginate_ranked
+from .search import search_events
+from .series import SERIES_HORIZON_DAYS, next_occurrences, paginate_with_series, search_series
+from .metrics import registry
+from .fragments import render_event_cards
+from .caching import active_series, featured_events, cached_home_page, invalidate_home, events_change_marker
+from .outbox import enqueue_email
+from .recommendations import recommended_events
+from .auth import get_profile
+from .replicas import use_replica
+from .live import format_sse, get_broker
+from . import calendar
+
+EVENTS_PAGE_SIZE = 20
+SEARCH_SERIES_LIMIT = 5
+RECOMMENDATIONS_SLOT = '<!-- recommended-events -->'
+PAST_EVENTS_LIMIT = 10
+SERIES_SESSIONS_SHOWN = 4  # Upcoming sessions listed per series on the dashboard
+ROSTER_CHUNK_SIZE = 2000
 
 # Home Page View
+@use_replica
 def home(request):
-    # Show 3 upcoming events as featured
-    featured_events = Event.objects.filter(event_date__gte=date.today()).order_by('event_date')[:3]
-    return render(request, 'events/index.html', {'featured_events': featured_events})
+    html = home_page(request, request.user.is_authenticated)
+    if request.user.is_authenticated:
+        html = fill_recommendations(request, html, recommended_events(request.user))
+    return HttpResponse(html)
+
+
+def home_page(request, authenticated):
+    # Served from the cache, see events/caching.py
+    def render_page():
+        return render_to_string('events/index.html', {'featured_events': featured_events()}, request=request)
+
+    return cached_home_page(authenticated, render_page)
+
+
+def fill_recommendations(request, html, recommended):
+    # The cached page is shared, fill in this user's suggestions
+    suggestions = render_to_string('events/recommended_events.html', {
+        'recommended_events': recommended,
+    }, request=request)
+    return html.replace(RECOMMENDATIONS_SLOT, suggestions, 1)
 
 
 # Events List Page View
+@use_replica
 def events(request):
-    # Auto-delete past events
-    Event.objects.filter(event_date__lt=date.today()).delete()
+    query, events, series = events_query(request)
+    if query:
+        page, next_cursor = paginate_ranked(events, request.GET.get('after'), EVENTS_PAGE_SIZE)
+        if not request.GET.get('after'):
+            page = next_occurrences(series, SEARCH_SERIES_LIMIT) + page
+    else:
+        page, next_cursor = paginate_with_series(events, series, request.GET.get('after'), EVENTS_PAGE_SIZE)
+    return render_events_page(request, query, page, next_cursor)
 
-    query = request.GET.get('q')  # Get the search query
 
+def events_query(request):
+    """The search text, the events to list and the series whose occurrences go with them.
+
+    Without a search: upcoming events, merged in date order with the series'
+    occurrences. With one: the matches best first, led on the first page by
+    the next session of each matching series.
+    """
+    # Past events are moved to the archive by the prune_events command,
+    # here we only hide the ones it has not reached yet
+    upcoming = Event.objects.filter(event_date__gte=date.today())
+
+    query = request.GET.get('q')  # Get the search query
     if query:
-        all_events = Event.objects.filter(
-            Q(event_name__icontains=query) | Q(event_location__icontains=query)
-        ).order_by("event_date")
+        # Full-text index lookup, best matches first
+        return query, search_events(upcoming, query), search_series(active_series(), query)
+    return query, upcoming, active_series()
+
+
+def render_events_page(request, query, page, next_cursor):
+    # Seat counts come from Event.seats_taken, no per-card COUNT queries
+    return render(request, 'events/events.html', {
+        "events": page,
+        "cards": render_event_cards(page, request.user),
+        "query": query or '',
+        "next_cursor": next_cursor,
+    })
+
+
+# Read-only JSON events API, see api_events below
+API_FIELDS = (
+    'id', 'event_name', 'sport_type', 'event_date', 'event_time', 'event_location',
+    'event_description', 'total_players', 'seats_taken', 'seats_left',
+)
+API_DEFAULT_FIELDS = tuple(field for field in API_FIELDS if field != 'event_description')
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 100
+
+
+def api_events_etag(request):
+    # Changes with any event or participation, the day, and the query
+    key = f"{events_change_marker()}:{date.today()}:{request.GET.urlencode()}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+class ApiError(ValueError):
+    pass
+
+
+def api_error(message):
+    return JsonResponse({'error': message}, status=400)
+
+
+def serialize_event(event, fields):
+    data = {}
+    for field in fields:
+        if field == 'seats_left':
+            data[field] = max(event.total_players - event.seats_taken, 0)
+        else:
+            value = getattr(event, field)
+            data[field] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return data
+
+
+# Unchanged boards are answered with 304 from the ETag alone, before any
+# event query runs. There is no Last-Modified: HTTP dates have one second
+# resolution, so a second change within the same second would still get a 304.
+@use_replica
+@require_GET
+@condition(etag_func=api_events_etag)
+def api_events(request):
+    try:
+        fields, queryset, limit = api_events_query(request.GET)
+    except ApiError as error:
+        return api_error(str(error))
+
+    if request.GET.get('q'):
+        page, next_cursor = paginate_ranked(queryset, request.GET.get('after'), limit)
     else:
-        all_events = Event.objects.all().order_by("event_date")
+        page, next_cursor = paginate_events(queryset, request.GET.get('after'), limit)
+    return api_events_response(request, fields, page, next_cursor)
 
-    return render(request, 'events/events.html', {"events": all_events})
+
+def api_events_query(params):
+    """Validate the API parameters, return (fields, events, page size) or raise ApiError.
+
+    With ``q`` the events are search results, to be paginated by rank.
+    """
+    fields = params['fields'].split(',') if params.get('fields') else API_DEFAULT_FIELDS
+    unknown = set(fields) - set(API_FIELDS)
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    try:
+        date_from = date.fromisoformat(params['date_from']) if params.get('date_from') else date.today()
+        date_to = date.fromisoformat(params['date_to']) if params.get('date_to') else None
+        limit = min(int(params.get('limit', API_PAGE_SIZE)), API_MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError("date_from and date_to must be YYYY-MM-DD and limit a number.")
+    if limit < 1:
+        raise ApiError("limit must be positive.")
+
+    queryset = Event.objects.filter(event_date__gte=max(date_from, date.today()))
+    if date_to:
+        queryset = queryset.filter(event_date__lte=date_to)
+    if params.get('sport_type'):
+        queryset = queryset.filter(sport_type=params['sport_type'])
+
+    # Only load the requested columns, plus the ones pagination needs
+    columns = {'id', 'event_date'} | (set(fields) - {'seats_left'})
+    if 'seats_left' in fields:
+        columns |= {'total_players', 'seats_taken'}
+    queryset = queryset.only(*columns)
+
+    if params.get('q'):
+        queryset = search_events(queryset, params['q'])
+    return fields, queryset, limit
+
+
+def api_events_response(request, fields, page, next_cursor):
+    next_url = None
+    if next_cursor:
+        next_params = request.GET.copy()
+        next_params['after'] = next_cursor
+        next_url = f"{request.path}?{next_params.urlencode()}"
+
+    response = JsonResponse({
+        'results': [serialize_event(event, fields) for event in page],
+        'next': next_url,
+    })
+    # Let clients and proxies keep it, but always revalidate
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+# Live seat counts as Server-Sent Events, see events/live.py
+LIVE_MAX_EVENTS = 200
+LIVE_HEARTBEAT_SECONDS = 15
+
+
+@require_GET
+async def live_seats(request):
+    if not isinstance(request, ASGIRequest):
+        # A never-ending response would hold a WSGI worker forever. The page
+        # still works, it just doesn't update live.
+        return HttpResponse("Live updates need the ASGI server.", status=501)
+
+    try:
+        event_ids = {int(value) for value in request.GET['events'].split(',')} if request.GET.get('events') else None
+    except ValueError:
+        return HttpResponse("events must be a comma-separated list of ids.", status=400)
+    if event_ids and len(event_ids) > LIVE_MAX_EVENTS:
+        return HttpResponse(f"At most {LIVE_MAX_EVENTS} events per stream.", status=400)
+
+    async def stream():
+        broker = get_broker()
+        subscription = broker.subscribe(event_ids)
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                batch = await subscription.next_batch(LIVE_HEARTBEAT_SECONDS)
+                # The comment line keeps proxies from closing an idle stream
+                yield format_sse(batch) if batch else ': ping\n\n'
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Subscribable calendar of the user's events, see events/calendar.py.
+# Always read from the primary: a lagging replica could serve old events
+# under the new ETag.
+def calendar_etag(request, token):
+    user_id = calendar.user_id_from_token(token)
+    if user_id is None:
+        return None
+    return hashlib.md5(f"{user_id}:{calendar.calendar_stamp(user_id)}".encode()).hexdigest()
+
+
+@require_GET
+@condition(etag_func=calendar_etag)
+def calendar_feed(request, token):
+    user_id = calendar.user_id_from_token(token)
+    if user_id is None:
+        raise Http404("Unknown calendar.")
+
+    response = StreamingHttpResponse(calendar.calendar_feed(user_id), content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = 'inline; filename="sportarena.ics"'
+    patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    return response
 
 
 # Add New Event (only accessible by logged-in users)
 @login_required
 def add_events(request):
     if request.method == "POST":
-        form = EventForm(request.POST)
+        form = NewEventForm(request.POST)
         if form.is_valid():
-            event = form.save(commit=False)
-            event.organizer = request.user  # Link event to the logged-in organizer
-            event.save()
+            if form.cleaned_data['repeat']:
+                # One row for the whole series, sessions are listed from it
+                form.save_series(organizer=request.user)
+            else:
+                event = form.save(commit=False)
+                event.organizer = request.user  # Link event to the logged-in organizer
+                event.save()
+            invalidate_home()
             return redirect('/events/?message=Event added successfully!')
     else:
-        form = EventForm()
+        form = NewEventForm()
 
     return render(request, 'events/add_events.html', {"form": form})
 
-# Contact page view
-def contact(request):
-    message_info = ''
-    
-    if request.method == 'POST':
-        form = ContactForm(request.POST)
-        if form.is_valid():
-            # Save in DB (optional)
-            form.save()
-
-            # Send Email to Admin
-            send_mail(
-                subject=f'New Contact from {form.cleaned_data["name"]}',
-                message=f"""
-                Name: {form.cleaned_data["name"]}
-                Email: {form.cleaned_data["email"]}
-                Message:
-                {form.cleaned_data["message"]}
-                """,
-                from_email=settings.EMAIL_HOST_USER,
-                recipient_list=['admin@example.com'],  # Change to your admin email
-                fail_silently=False,
-            )
-
-            message_info = "Thank you! Your message has been sent successfully."
-            return redirect(f'/contact/?message={message_info}')
-    else:
-        form = ContactForm()
-
-    message_info = request.GET.get('message', '')
-
-    return render(request, 'events/contact.html', {
-        'form': form,
-        'message': message_info,
-    })
-
-
 # User Registration View
 def register(request):
     if request.method == "POST":
@@ -123,15 +328,34 @@ def user_login(request):
 @login_required
 def join_event(request, event_id):
     event = get_object_or_404(Event, id=event_id)
+    return join(request, event)
+
+
+# Join a series occurrence that has no Event row yet
+@login_required
+def join_occurrence(request, series_id, occurrence_date):
+    series = get_object_or_404(EventSeries, id=series_id)
+    try:
+        day = date.fromisoformat(occurrence_date)
+    except ValueError:
+        raise Http404("Not a date.")
+    if day < date.today() or not series.occurs_on(day):
+        raise Http404("No session of this series on that date.")
+
+    saved = series.occurrences.filter(occurrence_date=day).first()
+    if saved is not None:
+        return redirect('join_event', saved.id)
+    return join(request, series.occurrence(day))
+
 
-    # Prevent joining multiple times
-    already_joined = EventParticipant.objects.filter(event=event, user=request.user).exists()
+def join(request, event):
+    # Prevent joining multiple times (an unsaved occurrence has no participants)
+    already_joined = event.pk is not None and EventParticipant.objects.filter(event=event, user=request.user).exists()
     if already_joined:
         return redirect('/events/?message=You have already joined this event.')
 
     # Prevent joining if event is full
-    participants_count = EventParticipant.objects.filter(event=event).count()
-    if participants_count >= event.total_players:
+    if event.is_full:
         return redirect('/events/?message=Event is full. Cannot join.')
 
     if request.method == "POST":
@@ -142,17 +366,22 @@ def join_event(request, event_id):
             if input_email != request.user.email:
                 form.add_error('email', "Email must match your registered email.")
             else:
-                # Save the join info separately
-                join_info = EventJoinInfo.objects.create(
-                    event=event,
-                    user=request.user,
-                    name=form.cleaned_data['name'],
-                    email=form.cleaned_data['email'],
-                    phone_number=form.cleaned_data['phone_number']
-                )
-
-                # Add the user as a participant
-                EventParticipant.objects.create(event=event, user=request.user)
+                if event.pk is None:
+                    # The first join gives the occurrence its row
+                    event = event.series.materialize(event.occurrence_date)
+                # Claim the seat and save the join info in one transaction,
+                # the checks above can be outdated by concurrent joins
+                try:
+                    event.add_participant(
+                        request.user,
+                        name=form.cleaned_data['name'],
+                        email=form.cleaned_data['email'],
+                        phone_number=form.cleaned_data['phone_number'],
+                    )
+                except AlreadyJoinedError:
+                    return redirect('/events/?message=You have already joined this event.')
+                except EventFullError:
+                    return redirect('/events/?message=Event is full. Cannot join.')
 
                 return redirect(f'/events/?message=Successfully joined the event: {event.event_name}')
     else:
@@ -177,6 +406,7 @@ def edit_event(request, event_id):
         form = EventForm(request.POST, instance=event)
         if form.is_valid():
             form.save()
+            invalidate_home()
             return redirect('/dashboard/?message=Event updated successfully!')
     else:
         form = EventForm(instance=event)
@@ -194,63 +424,194 @@ def delete_event(request, event_id):
 
     if request.method == "POST":
         event.delete()
+        invalidate_home()
         return redirect('/dashboard/?message=Event deleted successfully!')
     
     # Show confirmation page
     return render(request, 'events/delete_event.html', {"event": event})
 
 
+# Recurring series, managed by their organizer from the dashboard. Sessions
+# with their own Event row (someone joined) are also edited or deleted one
+# by one like other events.
+def organizer_series(request, series_id):
+    series = get_object_or_404(EventSeries, id=series_id)
+    if series.organizer != request.user:
+        return None
+    return series
+
+
 @login_required
-def dashboard(request):
+def edit_series(request, series_id):
+    series = organizer_series(request, series_id)
+    if series is None:
+        return redirect('/dashboard/?message=You are not allowed to edit this series.')
+
+    if request.method == "POST":
+        form = SeriesForm(request.POST, instance=series)
+        if form.is_valid():
+            with transaction.atomic():
+                form.save()
+                # Upcoming sessions with their own row follow the series
+                series.update_occurrences(date.today())
+            return redirect('/dashboard/?message=Series updated successfully!')
+    else:
+        form = SeriesForm(instance=series)
+
+    return render(request, 'events/edit_event.html', {"form": form, "series": series})
+
+
+@login_required
+@require_POST
+def skip_session(request, series_id, occurrence_date):
+    series = organizer_series(request, series_id)
+    if series is None:
+        return redirect('/dashboard/?message=You are not allowed to change this series.')
     try:
-        profile = UserProfile.objects.get(user=request.user)
-    except UserProfile.DoesNotExist:
-        profile = None  
+        day = date.fromisoformat(occurrence_date)
+    except ValueError:
+        raise Http404("Not a date.")
+    if day < date.today() or not series.occurs_on(day):
+        raise Http404("No session of this series on that date.")
 
-    created_events = Event.objects.filter(organizer=request.user)
-    joined_events = EventParticipant.objects.filter(user=request.user)
+    series.skip(day)
+    return redirect(f'/dashboard/?message=Cancelled the {day.isoformat()} session of {series.event_name}.')
 
-    for event in created_events:
-        sport_slug = event.sport_type.lower().replace(' ', '')
-        event.image_path = f'events/images/{sport_slug}.jpg'
 
+@login_required
+@require_POST
+def end_series(request, series_id):
+    series = organizer_series(request, series_id)
+    if series is None:
+        return redirect('/dashboard/?message=You are not allowed to change this series.')
+
+    series.end(date.today())
+    return redirect(f'/dashboard/?message=Ended the series: {series.event_name}.')
+
+
+@login_required
+def dashboard(request):
+    queries = dashboard_queries(request.user)
+    return render_dashboard(
+        request,
+        created_series=queries['created_series'],
+        created_events=queries['created_events'],
+        joined_events=queries['joined_events'],
+        join_info=queries['join_info'],
+        past_events=queries['past_events'],
+        recommended=recommended_events(request.user),
+    )
+
+
+def dashboard_queries(user):
+    """The dashboard's querysets, independent of each other."""
+    return {
+        'created_series': EventSeries.objects.filter(organizer=user).order_by('start_date', 'id'),
+        # Participants for all created events come in one prefetch query
+        'created_events': Event.objects.filter(organizer=user).prefetch_related(
+            Prefetch('participants', queryset=EventParticipant.objects.select_related('user'))
+        ),
+        'joined_events': EventParticipant.objects.filter(user=user).select_related('event'),
+        # One join info lookup for every event, keyed by (event, user)
+        'join_info': EventJoinInfo.objects.filter(event__organizer=user),
+        'past_events': ArchivedParticipation.objects.filter(user=user).select_related('event').order_by('-event__event_date')[:PAST_EVENTS_LIMIT],
+    }
+
+
+def render_dashboard(request, created_series, created_events, joined_events, join_info, past_events, recommended):
+    join_info = {(info.event_id, info.user_id): info for info in join_info}
+
+    today = date.today()
+    for series in created_series:
+        # Generated, no query
+        sessions = series.dates(today, today + timedelta(days=SERIES_HORIZON_DAYS))
+        series.upcoming_dates = list(islice(sessions, SERIES_SESSIONS_SHOWN))
+
+    for event in created_events:
         # Get participant + join info
-        participants = EventParticipant.objects.filter(event=event).select_related('user')
         event.participant_details = []
-        for p in participants:
-            join_info = EventJoinInfo.objects.filter(event=event, user=p.user).first()
+        for p in event.participants.all():
+            info = join_info.get((event.id, p.user_id))
             event.participant_details.append({
                 "username": p.user.username,
                 "email": p.user.email,
-                "name": join_info.name if join_info else "-",
-                "phone": join_info.phone_number if join_info else "-",
+                "name": info.name if info else "-",
+                "phone": info.phone_number if info else "-",
             })
 
-
-    for joined in joined_events:
-        sport_slug = joined.event.sport_type.lower().replace(' ', '')
-        joined.image_path = f'events/images/{sport_slug}.jpg'
-
     return render(request, 'events/dashboard.html', {
-        'profile': profile,
+        # Loaded together with request.user by CachedModelBackend
+        'profile': get_profile(request.user),
+        'created_series': created_series,
         'created_events': created_events,
         'joined_events': joined_events,
+        'past_events': past_events,
+        'recommended_events': recommended,
+        'calendar_url': request.build_absolute_uri(reverse('calendar_feed', args=[calendar.calendar_token(request.user)])),
     })
 
 
+class Echo:
+    """File-like object that hands back what is written, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def spreadsheet_safe(value):
+    # Cells starting like a formula are run by spreadsheet apps, the quote
+    # makes them plain text
+    if value and value[0] in '=+-@\t\r':
+        return "'" + value
+    return value
+
+
+# Stream an event's participants as CSV for the organizer. One query, read
+# in chunks, so even very large rosters use constant memory.
+@login_required
+def export_roster(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if event.organizer != request.user:
+        return redirect('/dashboard/?message=You are not allowed to export this roster.')
+
+    join_info = EventJoinInfo.objects.filter(event=OuterRef('event'), user=OuterRef('user'))
+    rows = EventParticipant.objects.filter(event=event).order_by('id').values_list(
+        'user__username',
+        'user__email',
+        Subquery(join_info.values('name')[:1]),
+        Subquery(join_info.values('email')[:1]),
+        Subquery(join_info.values('phone_number')[:1]),
+        'joined_at',
+    ).iterator(chunk_size=ROSTER_CHUNK_SIZE)
+
+    writer = csv.writer(Echo())
+
+    def stream():
+        yield writer.writerow(['Username', 'Account Email', 'Full Name', 'Contact Email', 'Phone', 'Joined At'])
+        for username, account_email, name, email, phone, joined_at in rows:
+            # Escape before the placeholder so missing join info stays a plain -
+            cells = [spreadsheet_safe(username), spreadsheet_safe(account_email)]
+            cells += [spreadsheet_safe(value) if value else '-' for value in (name, email, phone)]
+            yield writer.writerow(cells + [joined_at.isoformat()])
+
+    response = StreamingHttpResponse(stream(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="roster-{event.id}.csv"'
+    return response
+
+
 @login_required
 def cancel_joined_event(request, event_id):
     event = get_object_or_404(Event, id=event_id)
-    participation = EventParticipant.objects.filter(event=event, user=request.user)
 
-    if participation.exists():
-        participation.delete()
+    if event.remove_participant(request.user):
         message = f'You have successfully cancelled your participation in: {event.event_name}.'
     else:
         message = 'You are not a participant of this event.'
 
     return redirect(f'/dashboard/?message={message}')
 
+# Contact page view
 def contact(request):
     success_message = None
 
@@ -260,10 +621,32 @@ def contact(request):
         message = request.POST.get('message')
 
         if name and email and message:
-            ContactMessage.objects.create(name=name, email=email, message=message)
+            with transaction.atomic():
+                ContactMessage.objects.create(name=name, email=email, message=message)
+
+                # Notify the admins, the send_queued_email worker delivers it
+                enqueue_email(
+                    subject=f'New Contact from {name}',
+                    body=f"Name: {name}\nEmail: {email}\nMessage:\n{message}\n",
+                    recipients=settings.CONTACT_EMAIL_RECIPIENTS,
+                )
             success_message = "Your message has been sent successfully!"
 
     return render(request, 'events/contact.html', {
         'success_message': success_message
     })
 
+
+def metrics_allowed(request):
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+# Prometheus scrape endpoint, numbers are per worker process
+def metrics(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+Serve the site with an ASGI server (e.g. uvicorn sportsbuddy.asgi:application)
+for the live seat counts stream at /events/live/, which holds one cheap
+coroutine per open tab instead of a worker thread. The busiest read views
+are served by their async versions too, see ASYNC_VIEWS in settings.py.
 """
 
 import os
@@ -12,5 +17,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sportsbuddy.settings')
+os.environ.setdefault('ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,37 @@
+"""
+Cache settings from CACHE_URL, like the database ones in database.py.
+
+    redis://cache.internal:6379/0       Redis (needs the redis package)
+    memcached://mc1:11211,mc2:11211     Memcached (needs pymemcache)
+    db://django_cache                   a database table, run createcachetable first
+    locmem://                           memory of each process, for development
+
+Event cards, the home page, the API change marker, recommendation
+versions, cached users and calendar stamps are all invalidated through the
+cache. With several processes (gunicorn workers, management commands next
+to the web server) it must be shared, or invalidations made in one process
+never reach the others. Without CACHE_URL, DEBUG gets locmem and anything
+else the database cache.
+"""
+from urllib.parse import urlsplit
+
+LOCMEM_MAX_ENTRIES = 10000
+
+
+def parse_cache_url(url):
+    parts = urlsplit(url)
+    if parts.scheme in ('redis', 'rediss'):
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': url}
+    if parts.scheme == 'memcached':
+        return {'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache', 'LOCATION': parts.netloc.split(',')}
+    if parts.scheme == 'db':
+        return {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': parts.netloc or 'django_cache'}
+    if parts.scheme == 'locmem':
+        return {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'OPTIONS': {'MAX_ENTRIES': LOCMEM_MAX_ENTRIES}}
+    raise ValueError(f"Unsupported cache URL scheme '{parts.scheme}' in {url!r}.")
+
+
+def caches_from_env(environ, debug):
+    """CACHES from CACHE_URL, or the default for development or production."""
+    url = environ.get('CACHE_URL') or ('locmem://' if debug else 'db://django_cache')
+    return {'default': parse_cache_url(url)}
@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 import os
 
+from .caches import caches_from_env
+from .database import databases_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'events.metrics.MetricsMiddleware',
+    'events.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,10 +60,18 @@ ROOT_URLCONF = 'sportsbuddy.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that reports render time to the metrics middleware
+        'BACKEND': 'events.metrics.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'events/templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compile each template once per process. The dev server's
+            # autoreloader still resets the cache when a template changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -75,12 +88,55 @@ WSGI_APPLICATION = 'sportsbuddy.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Configured from DATABASE_URL and DATABASE_REPLICA_URLS (see
+# sportsbuddy/database.py). Without them: db.sqlite3 and no replicas.
+DATABASES, DATABASE_REPLICAS = databases_from_env(os.environ, BASE_DIR)
+
+# Safe GET views marked @use_replica read from a replica (events/replicas.py)
+DATABASE_ROUTERS = ['events.replicas.ReplicaRouter']
+# A client that just wrote reads from the primary for this long, so it sees
+# its own change even if the replicas lag behind
+REPLICA_PIN_SECONDS = 10
+
+# Opt-in tuning for serving real traffic from SQLite: set SQLITE_PRODUCTION=1.
+# Connections are kept between requests, write transactions take the write
+# lock up front (BEGIN IMMEDIATE) and wait for it instead of failing with
+# "database is locked", and events/db.py switches new connections to WAL so
+# readers never block the writer.
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION') == '1'
+SQLITE_BUSY_TIMEOUT = 20  # seconds
+
+if SQLITE_PRODUCTION:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.sqlite3':
+            database.update({
+                'CONN_MAX_AGE': 600,
+                'CONN_HEALTH_CHECKS': True,
+                'OPTIONS': {'timeout': SQLITE_BUSY_TIMEOUT, 'transaction_mode': 'IMMEDIATE'},
+            })
+
+
+# Cache
+# Event cards and other fragments are cached here, and invalidated by any
+# process that changes them. Configured from CACHE_URL (see
+# sportsbuddy/caches.py): production needs a backend shared by all workers
+# and management commands, per-process memory is for development only.
+
+CACHES = caches_from_env(os.environ, DEBUG)
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = [
+    # Caches the logged-in user and profile, see events/auth.py
+    'events.auth.CachedModelBackend',
+    # Sessions created before the cached backend still name this one
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Seconds the home page and its featured events are cached. Entries also
+# expire at midnight so the featured set rolls over with the date.
+HOME_CACHE_TIMEOUT = 300
 
 
 # Password validation
@@ -130,3 +186,33 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+
+# Event search backend, see events/search.py. When unset it is picked from
+# the database: SQLite FTS5, PostgreSQL full-text search, or a basic
+# unindexed fallback.
+# EVENT_SEARCH_BACKEND = 'events.search.BasicSearchBackend'
+
+# Fan-out for the live seat counts stream, see events/live.py. When unset:
+# PostgreSQL LISTEN/NOTIFY (works across processes) on PostgreSQL, else
+# in-process only, which needs a single ASGI worker process.
+# SEAT_BROKER_BACKEND = 'events.live.LocalBroker'
+
+# Serve home, events, the events API and the dashboard from the async views
+# in events/async_views.py. sportsbuddy/asgi.py turns this on, under WSGI the
+# sync views are faster.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS') == '1'
+
+# Email
+# Mail is queued in the database and sent by 'manage.py send_queued_email'.
+# Configure EMAIL_HOST, EMAIL_PORT, EMAIL_HOST_USER and EMAIL_HOST_PASSWORD
+# for the SMTP server in production.
+
+DEFAULT_FROM_EMAIL = 'SportArena <noreply@example.com>'
+CONTACT_EMAIL_RECIPIENTS = ['admin@example.com']  # Change to your admin email
+
+# Requests slower than this are logged with their slowest SQL queries
+SLOW_REQUEST_THRESHOLD_MS = 500
+
+# /metrics is shown to staff users, and to scrapers that send
+# "Authorization: Bearer <METRICS_TOKEN>" when this is set
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')